@@ -0,0 +1,189 @@
+import argparse
+import io
+import json
+import mmap
+import os
+import struct
+
+from constants import ASSET_PACK_FILE, resource_dir
+
+ASSET_PACK_MAGIC = b"SNAKEPAK"
+ASSET_PACK_DIRECTORIES = ("fonts", "sounds")  # Directories whose files are packed, relative to the project directory
+
+# Magic bytes, then the length of the JSON index that follows, as a little-endian 32-bit unsigned integer
+_HEADER = struct.Struct("<8sI")
+
+_asset_pack = None  # The AssetPack loaded by load_asset_pack(), or None to open the loose files
+
+
+class AssetFile(io.RawIOBase):
+    """A read-only file object over one file stored in a memory-mapped asset pack.
+
+    Reads copy straight from the mapped pack into the caller's buffer, so pygame can load fonts and sounds from it
+    like from a file on disk.
+    """
+
+    def __init__(self, data):
+        """Initialize the file at its start.
+
+        Args:
+            data (memoryview): The contents of the file, a slice of the mapped pack.
+        """
+        super().__init__()
+        self._data = data
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), len(self._data) - self._position)
+        if size <= 0:
+            return 0
+
+        buffer[:size] = self._data[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._data)
+        if offset < 0:
+            raise ValueError("negative seek position")
+
+        self._position = offset
+        return offset
+
+    def tell(self):
+        return self._position
+
+
+class AssetPack:
+    """An archive of asset files, memory-mapped so that its files are read without opening them one by one.
+
+    The pack starts with ASSET_PACK_MAGIC and the length of a JSON index, which maps the path of each file, relative
+    to the project directory and with forward slashes, to the [offset, size] of its contents. The contents of the
+    files follow the index, and offsets are counted from the end of the index.
+
+    Attributes:
+        index (dict): The [offset, size] of each file, keyed by path.
+    """
+
+    def __init__(self, path):
+        """Map an asset pack into memory and read its index.
+
+        Args:
+            path (str): The path of the asset pack.
+
+        Raises:
+            ValueError: If the file is not an asset pack.
+        """
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_size = _HEADER.unpack_from(self._map)
+        if magic != ASSET_PACK_MAGIC:
+            raise ValueError(f"{path} is not an asset pack")
+
+        self.index = json.loads(self._map[_HEADER.size:_HEADER.size + index_size])
+        self._data = memoryview(self._map)[_HEADER.size + index_size:]
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def open(self, name):
+        """Open a file in the pack.
+
+        Args:
+            name (str): The path of the file, relative to the project directory.
+
+        Returns:
+            AssetFile: The file, read straight from the mapped pack.
+        """
+        offset, size = self.index[name]
+        return AssetFile(self._data[offset:offset + size])
+
+
+def load_asset_pack(path=ASSET_PACK_FILE):
+    """Map the asset pack into memory, so that open_resource() reads from it. Does nothing if there is no pack.
+
+    Args:
+        path (str): The path of the asset pack.
+    """
+    global _asset_pack
+    if _asset_pack is None and os.path.exists(path):
+        _asset_pack = AssetPack(path)
+
+
+def open_resource(path):
+    """Open a resource for reading, from the asset pack if it was loaded and contains it, or else from its file.
+
+    Args:
+        path (str): The absolute path to the resource, from constants.resource_path().
+
+    Returns:
+        A binary file object.
+    """
+    if _asset_pack is not None:
+        name = os.path.relpath(path, resource_dir()).replace(os.sep, "/")
+        if name in _asset_pack:
+            return _asset_pack.open(name)
+    return open(path, "rb")
+
+
+def build_asset_pack(output_path, root=".", directories=ASSET_PACK_DIRECTORIES):
+    """Write every file in the asset directories into a new asset pack.
+
+    Args:
+        output_path (str): The path of the asset pack to write.
+        root (str): The project directory the asset directories are in.
+        directories (tuple): The asset directories, relative to `root`.
+
+    Returns:
+        dict: The index of the pack that was written.
+    """
+    names = []
+    for directory in directories:
+        for dir_path, _, file_names in os.walk(os.path.join(root, directory)):
+            for file_name in file_names:
+                names.append(os.path.relpath(os.path.join(dir_path, file_name), root).replace(os.sep, "/"))
+    names.sort()
+
+    contents = []
+    for name in names:
+        with open(os.path.join(root, name), "rb") as f:
+            contents.append(f.read())
+
+    offset = 0
+    index = {}
+    for name, data in zip(names, contents):
+        index[name] = [offset, len(data)]
+        offset += len(data)
+    index_bytes = json.dumps(index).encode()
+
+    with open(output_path, "wb") as f:
+        f.write(_HEADER.pack(ASSET_PACK_MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for data in contents:
+            f.write(data)
+
+    return index
+
+
+def main():
+    """Build the asset pack from the command line."""
+    parser = argparse.ArgumentParser(description="Pack the Snake fonts and sounds into a single file.")
+    parser.add_argument("--output", default=ASSET_PACK_FILE, help=f"file to write (default: {ASSET_PACK_FILE})")
+    args = parser.parse_args()
+
+    index = build_asset_pack(args.output)
+    print(f"Packed {len(index)} files into {args.output} ({os.path.getsize(args.output)} bytes).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,634 @@
+import functools
+import heapq
+from array import array
+from collections import deque
+
+from engine import ORIENTATIONS
+
+# Shortcuts off the Hamiltonian cycle are only taken while the snake covers less than this fraction of the board
+SHORTCUT_MAX_FILL = 0.5
+# Number of free cells a shortcut must leave between the head and the tail along the cycle, so the snake can grow
+SHORTCUT_MARGIN = 4
+
+UNREACHABLE = 0x7FFFFFFF  # The distance of a cell from which no fruit can be reached
+# The distance field is computed again from scratch when a move changes the distance of more than 1 / this of the
+# board's cells
+LOST_CELLS_MAX_FRACTION = 16
+
+# Maps a cell's occupancy to 1 if the cell is free and 0 if the snake covers it, for bytearray.translate()
+_FREE_CELLS_TABLE = bytes([1] + [0] * 255)
+
+
+def _next_cell(board_dimensions, wraps, cell, orientation):
+    """Get the cell reached by moving from a cell in a direction.
+
+    Args:
+        board_dimensions (tuple): Number of grid cells (columns, rows).
+        wraps (bool): Whether the board wraps around its edges.
+        cell (int): The cell index to move from.
+        orientation (tuple): The movement direction (dx, dy).
+
+    Returns:
+        int or None: The cell index reached, or None if the move leaves a board that does not wrap around.
+    """
+    width, height = board_dimensions
+    y, x = divmod(cell, width)
+    x += orientation[0]
+    y += orientation[1]
+
+    if wraps:
+        x %= width
+        y %= height
+    elif not (0 <= x < width and 0 <= y < height):
+        return None
+
+    return y * width + x
+
+
+def _neighbors(board_dimensions, wraps, cell):
+    """Get the cells next to a cell.
+
+    Args:
+        board_dimensions (tuple): Number of grid cells (columns, rows).
+        wraps (bool): Whether the board wraps around its edges.
+        cell (int): The cell index.
+
+    Returns:
+        tuple: The indices of the two to four cells one move away.
+    """
+    width, height = board_dimensions
+    y, x = divmod(cell, width)
+    if wraps:
+        row = y * width
+        return (row + (x - 1) % width, row + (x + 1) % width, ((y - 1) % height) * width + x,
+                ((y + 1) % height) * width + x)
+
+    neighbors = []
+    if x > 0:
+        neighbors.append(cell - 1)
+    if x < width - 1:
+        neighbors.append(cell + 1)
+    if y > 0:
+        neighbors.append(cell - width)
+    if y < height - 1:
+        neighbors.append(cell + width)
+    return tuple(neighbors)
+
+
+class _NeighborFunction:
+    """Looks up the cells next to a cell like a neighbor table, computing them on every lookup.
+
+    Used on boards with more than 65536 cells, where a table of every cell's neighbors would take too much memory.
+    """
+
+    __slots__ = ("board_dimensions", "wraps")
+
+    def __init__(self, board_dimensions, wraps):
+        self.board_dimensions = board_dimensions
+        self.wraps = wraps
+
+    def __getitem__(self, cell):
+        return _neighbors(self.board_dimensions, self.wraps, cell)
+
+
+@functools.lru_cache(maxsize=None)
+def _neighbor_table(board_dimensions, wraps):
+    """Get the cells next to each cell of a board.
+
+    Args:
+        board_dimensions (tuple): Number of grid cells (columns, rows).
+        wraps (bool): Whether the board wraps around its edges.
+
+    Returns:
+        list or _NeighborFunction: Indexed by cell index, the tuple of the cells one move away.
+    """
+    num_cells = board_dimensions[0] * board_dimensions[1]
+    if num_cells > 0xFFFF:
+        return _NeighborFunction(board_dimensions, wraps)
+    return [_neighbors(board_dimensions, wraps, cell) for cell in range(num_cells)]
+
+
+class HamiltonianCycle:
+    """A path that visits every cell of a board once and ends next to where it started.
+
+    The path runs right along the top row, snakes down the other rows without entering the first column, and comes
+    back up the first column. This needs an even number of rows, so on boards with an odd number of rows it runs
+    along the columns instead. Every board size in constants.py has an even number of both. Positions along the path
+    are computed from the coordinates of the cells, so the cycle takes no time to set up, even on the largest boards.
+
+    Attributes:
+        board_dimensions (tuple): Number of grid cells (columns, rows).
+        num_cells (int): The number of cells on the board, which is the length of the cycle.
+    """
+
+    def __init__(self, board_dimensions):
+        """Lay out the cycle of a board.
+
+        Args:
+            board_dimensions (tuple): Number of grid cells (columns, rows).
+
+        Raises:
+            ValueError: If the board has no Hamiltonian cycle, because it has an odd number of cells or a single row
+                        or column.
+        """
+        width, height = board_dimensions
+        if height % 2 == 0 and width >= 2:
+            self._transposed = False
+        elif width % 2 == 0 and height >= 2:
+            self._transposed = True
+            width, height = height, width
+        else:
+            raise ValueError(f"a {width} x {height} board has no Hamiltonian cycle")
+
+        self.board_dimensions = board_dimensions
+        self.num_cells = width * height
+        self._width = width  # The number of columns and rows of the path's layout, swapped if it is transposed
+        self._height = height
+
+    def position(self, cell):
+        """Get the position of a cell along the cycle.
+
+        Args:
+            cell (int): The cell index.
+
+        Returns:
+            int: The number of moves from the top left corner to the cell, from 0 to `num_cells` - 1.
+        """
+        y, x = divmod(cell, self.board_dimensions[0])
+        if self._transposed:
+            x, y = y, x
+
+        if y == 0:
+            return x
+        if x == 0:
+            return self.num_cells - y
+        return self._width + (y - 1) * (self._width - 1) + (self._width - 1 - x if y % 2 == 1 else x - 1)
+
+    def cell_at(self, position):
+        """Get the cell at a position along the cycle.
+
+        Args:
+            position (int): The number of moves from the top left corner, which wraps around the cycle.
+
+        Returns:
+            int: The cell index.
+        """
+        position %= self.num_cells
+        if position < self._width:
+            x, y = position, 0
+        elif position > self.num_cells - self._height:
+            x, y = 0, self.num_cells - position
+        else:
+            y, offset = divmod(position - self._width, self._width - 1)
+            y += 1
+            x = self._width - 1 - offset if y % 2 == 1 else offset + 1
+
+        if self._transposed:
+            x, y = y, x
+        return y * self.board_dimensions[0] + x
+
+
+class DistanceField:
+    """The number of moves from every cell to the nearest fruit, avoiding the snake, kept up to date as it moves.
+
+    The field is computed with a breadth-first search from all fruits, then only the cells whose distance changes
+    are updated: when the head covers a cell, the cells whose shortest path went through it are searched again from
+    the cells around them, and when the tail frees a cell or a fruit spawns, shorter distances spread out from it.
+    When a fruit is eaten or a move changes the distance of many cells, the whole field is computed again instead.
+
+    Attributes:
+        distances (array): For each cell index, the number of moves to the nearest fruit, or UNREACHABLE.
+    """
+
+    def __init__(self, state):
+        """Compute the field of a game.
+
+        Args:
+            state (GameState): The game to compute the field of.
+        """
+        self._neighbors = _neighbor_table(state.board_dimensions,
+                                         state.game_mode == "Infinite" or state.game_mode == "Peaceful")
+        self._compute(state)
+
+    def _compute(self, state):
+        """Compute the whole field.
+
+        Args:
+            state (GameState): The game to compute the field of.
+        """
+        self._free = state.occupancy.translate(_FREE_CELLS_TABLE)
+        self._fruits = set(state.fruits)
+        self._search()
+
+    def _search(self):
+        """Compute every distance with a breadth-first search from the fruits, over the free cells."""
+        self.distances = array("i", [UNREACHABLE]) * len(self._free)
+        for fruit in self._fruits:
+            self.distances[fruit] = 0
+        self._spread(deque(self._fruits))
+
+    def update(self, state, changed_cells):
+        """Update the field after the snake moved.
+
+        Args:
+            state (GameState): The game, after the move.
+            changed_cells (iterable): The cells whose occupancy may have changed, i.e. the new head and the old tail.
+        """
+        fruits = set(state.fruits)
+        if not self._fruits <= fruits:
+            self._compute(state)
+            return
+
+        new_fruits = fruits - self._fruits
+        self._fruits = fruits
+
+        for cell in changed_cells:
+            is_free = state.occupancy[cell] == 0
+            if is_free and not self._free[cell]:
+                self._release(cell)
+            elif not is_free and self._free[cell]:
+                self._cover(cell)
+
+        for fruit in new_fruits:
+            self.distances[fruit] = 0
+            self._spread(deque([fruit]))
+
+    def _spread(self, queue):
+        """Lower the distances of the cells around the queued cells, breadth first, until nothing changes.
+
+        Args:
+            queue (deque): Cells whose distance was just lowered, in increasing order of distance.
+        """
+        distances = self.distances
+        free = self._free
+        neighbors = self._neighbors
+
+        while queue:
+            cell = queue.popleft()
+            distance = distances[cell] + 1
+            for neighbor in neighbors[cell]:
+                if free[neighbor] and distances[neighbor] > distance:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+
+    def _release(self, cell):
+        """Update the field after a cell became free.
+
+        Args:
+            cell (int): The cell index.
+        """
+        self._free[cell] = 1
+        if cell in self._fruits:
+            distance = 0
+        else:
+            distance = min((self.distances[neighbor] for neighbor in
+                            self._neighbors[cell] if self._free[neighbor]),
+                           default=UNREACHABLE)
+            if distance == UNREACHABLE:
+                return
+            distance += 1
+
+        self.distances[cell] = distance
+        self._spread(deque([cell]))
+
+    def _cover(self, cell):
+        """Update the field after the snake covered a cell.
+
+        Args:
+            cell (int): The cell index.
+        """
+        distances = self.distances
+        free = self._free
+        neighbors = self._neighbors
+
+        free[cell] = 0
+        if distances[cell] == UNREACHABLE:
+            return
+
+        # Find the cells whose every shortest path went through the covered cell. Cells are found in increasing
+        # order of distance, so all the cells that lost their distance one move closer are known when a cell is
+        # checked for another path. Once that is a large part of the board, searching the whole board is faster.
+        max_lost_cells = len(distances) // LOST_CELLS_MAX_FRACTION
+        lost = {cell}
+        lost_cells = [cell]
+        queue = deque([cell])
+        while queue:
+            parent = queue.popleft()
+            distance = distances[parent] + 1
+            for child in neighbors[parent]:
+                if child in lost or not free[child] or distances[child] != distance:
+                    continue
+                if any(free[other] and distances[other] == distance - 1 and other not in lost
+                       for other in neighbors[child]):
+                    continue
+                lost.add(child)
+                lost_cells.append(child)
+                queue.append(child)
+
+            if len(lost_cells) > max_lost_cells:
+                self._search()
+                return
+
+        for lost_cell in lost_cells:
+            distances[lost_cell] = UNREACHABLE
+
+        # Search again from the cells around the lost cells, nearest first
+        heap = []
+        for lost_cell in lost_cells[1:]:
+            distance = min((distances[neighbor] for neighbor in neighbors[lost_cell]
+                            if free[neighbor]), default=UNREACHABLE)
+            if distance != UNREACHABLE:
+                distances[lost_cell] = distance + 1
+                heap.append((distance + 1, lost_cell))
+        heapq.heapify(heap)
+
+        while heap:
+            distance, lost_cell = heapq.heappop(heap)
+            if distance != distances[lost_cell]:
+                continue
+            for neighbor in neighbors[lost_cell]:
+                if free[neighbor] and distances[neighbor] > distance + 1:
+                    distances[neighbor] = distance + 1
+                    heapq.heappush(heap, (distance + 1, neighbor))
+
+
+class Autopilot:
+    """A controller that fills the board by following a Hamiltonian cycle, taking shortcuts to fruits when it is safe.
+
+    While the snake's segments lie along the cycle in order from the tail to the head, following the cycle can never
+    run into the snake, so the game is always won. While the snake is short, it may skip ahead along the cycle to the
+    neighbor nearest to a fruit in the DistanceField, as long as it passes neither its tail nor a fruit, which keeps
+    the segments in order. When the snake is not in cycle order, for instance in a game that was set up some other
+    way, it heads for the nearest fruit among the moves after which its tail can still be reached.
+
+    On boards with more than 65536 cells, computing the distance field would hold up the first move for seconds, so
+    distances to fruits are counted as if the snake was not there instead.
+
+    An Autopilot keeps its distance field between calls and sets it up again when it is given another game, so a
+    new instance is not needed for each game.
+    """
+
+    def __init__(self):
+        """Initialize the autopilot without a game."""
+        self._state = None
+        self._wraps = False
+        self._neighbors = None
+        self._moves = None
+        self._tail = None
+        self._field = None
+        self._cycle = None
+        self._cycle_direction = 1  # 1 to follow the cycle forwards, -1 to follow it backwards
+
+    def __call__(self, state):
+        """Choose the next direction.
+
+        A direction change only applies after the move in progress, so the plan starts from the cell the snake is
+        about to reach.
+
+        Args:
+            state (GameState): The game to play.
+
+        Returns:
+            tuple or None: The direction to steer towards, or None to keep going.
+        """
+        if state is not self._state or state.moves not in (self._moves, self._moves + 1):
+            self._start(state)
+        elif state.moves != self._moves and self._field is not None:
+            self._field.update(state, (state.body.last(), self._tail))
+        self._moves = state.moves
+        self._tail = state.body.first()
+
+        if state.was_moved:
+            start = _next_cell(state.board_dimensions, self._wraps, state.body.last(),
+                               state.current_orientation)
+            if start is None:
+                return None
+        else:
+            start = state.body.last()
+
+        if self._cycle is not None:
+            cell = self._follow_cycle(state, start)
+            if cell is not None:
+                return self._orientation_to(state, start, cell)
+            self._cycle = None
+
+        return self._avoid_traps(state, start)
+
+    def _start(self, state):
+        """Set up the distance field and the cycle of a game.
+
+        Args:
+            state (GameState): The game to play.
+        """
+        self._state = state
+        self._wraps = state.game_mode == "Infinite" or state.game_mode == "Peaceful"
+        self._neighbors = _neighbor_table(state.board_dimensions, self._wraps)
+        self._field = DistanceField(state) if len(state.occupancy) <= 0xFFFF else None
+
+        try:
+            self._cycle = HamiltonianCycle(state.board_dimensions)
+        except ValueError:
+            self._cycle = None
+            return
+
+        for self._cycle_direction in (1, -1):
+            if self._in_cycle_order(state.body):
+                return
+        self._cycle = None
+
+    def _in_cycle_order(self, body):
+        """Check whether the snake's segments lie along the cycle in order, from the tail to the head.
+
+        Args:
+            body (RingBuffer): The snake's segments.
+
+        Returns:
+            bool: Whether following the cycle from the head leads to the tail before any other segment.
+        """
+        total = 0
+        previous = body.first()
+        for cell in body:
+            total += self._cycle_distance(previous, cell)
+            previous = cell
+        return total < self._cycle.num_cells
+
+    def _cycle_distance(self, cell, other_cell):
+        """Get the number of moves from a cell to another along the cycle.
+
+        Args:
+            cell (int): The cell index to start from.
+            other_cell (int): The cell index to reach.
+
+        Returns:
+            int: The number of moves, from 0 to the number of cells minus one.
+        """
+        return ((self._cycle.position(other_cell) - self._cycle.position(cell)) * self._cycle_direction %
+                self._cycle.num_cells)
+
+    def _follow_cycle(self, state, start):
+        """Choose the next cell along the cycle, or a shortcut towards a fruit that keeps the snake in cycle order.
+
+        Args:
+            state (GameState): The game to play.
+            start (int): The cell the head moves from.
+
+        Returns:
+            int or None: The cell to move to, or None if the snake is no longer in cycle order.
+        """
+        body = state.body
+        eats = start in state.fruits
+        if not state.was_moved:
+            tail = body.first()
+            length = len(body)
+        else:
+            tail = body[0] if eats or len(body) == 1 else body[1]
+            length = len(body) + eats
+
+        cycle_next = self._cycle.cell_at(self._cycle.position(start) + self._cycle_direction)
+        if not self._is_free(state, start, cycle_next, eats):
+            return None
+
+        best_cell = cycle_next
+        if length < self._cycle.num_cells * SHORTCUT_MAX_FILL:
+            # Skipping past a fruit along the cycle would only come back to it a lap later
+            room = min([self._cycle_distance(start, tail) - SHORTCUT_MARGIN] +
+                       [self._cycle_distance(start, fruit) + 1 for fruit in state.fruits])
+            # Head for the nearest fruit if a move gets closer to it, and otherwise skip as far as possible, which
+            # also gets around to fruits that are behind the head along the cycle.
+            start_distance = self._fruit_distance(state, start)
+            best_rank = (min(self._fruit_distance(state, cycle_next), start_distance), -1)
+            for cell in self._neighbors[start]:
+                skip = self._cycle_distance(start, cell)
+                if 1 < skip < room:
+                    rank = (min(self._fruit_distance(state, cell), start_distance), -skip)
+                    if rank < best_rank:
+                        best_cell = cell
+                        best_rank = rank
+
+        return best_cell
+
+    def _avoid_traps(self, state, start):
+        """Choose the direction towards the nearest fruit among those after which the tail can still be reached.
+
+        Args:
+            state (GameState): The game to play.
+            start (int): The cell the head moves from.
+
+        Returns:
+            tuple or None: The direction to steer towards, or None if every direction ends the game.
+        """
+        eats = state.was_moved and start in state.fruits
+        if not state.was_moved:
+            tail = state.body.first()
+        else:
+            tail = state.body[0] if eats or len(state.body) == 1 else state.body[1]
+
+        reverse = (-state.current_orientation[0], -state.current_orientation[1])
+        best = None
+        for orientation in ORIENTATIONS:
+            if orientation == reverse:
+                continue
+
+            cell = _next_cell(state.board_dimensions, self._wraps, start, orientation)
+            if cell is None or not (state.game_mode == "Peaceful" or self._is_free(state, start, cell, eats)):
+                continue
+
+            rank = (not self._reaches_tail(state, start, cell, tail), self._fruit_distance(state, cell))
+            if best is None or rank < best[0]:
+                best = (rank, orientation)
+
+        return None if best is None else best[1]
+
+    def _fruit_distance(self, state, cell):
+        """Get the number of moves from a cell to the nearest fruit.
+
+        Args:
+            state (GameState): The game to play.
+            cell (int): The cell index.
+
+        Returns:
+            int: The distance from the distance field, or the distance ignoring the snake if there is no field.
+        """
+        if self._field is not None:
+            return self._field.distances[cell]
+
+        width, height = state.board_dimensions
+        y, x = divmod(cell, width)
+        nearest = UNREACHABLE
+        for fruit in state.fruits:
+            fruit_y, fruit_x = divmod(fruit, width)
+            dx = abs(x - fruit_x)
+            dy = abs(y - fruit_y)
+            if self._wraps:
+                dx = min(dx, width - dx)
+                dy = min(dy, height - dy)
+            nearest = min(nearest, dx + dy)
+        return nearest
+
+    def _is_free(self, state, start, cell, eats):
+        """Check whether moving from the cell the head is about to reach to a cell is safe.
+
+        Args:
+            state (GameState): The game to play.
+            start (int): The cell the head moves from.
+            cell (int): The cell to move to.
+            eats (bool): Whether the snake grows when it reaches `start`.
+
+        Returns:
+            bool: Whether the cell is not covered by the snake when the head gets there, other than by its tail.
+        """
+        if not state.was_moved:
+            return state.occupancy[cell] == 0 or (cell == state.body.first() and state.occupancy[cell] == 1)
+        if cell == start:
+            return False
+
+        body = state.body
+        occupancy = state.occupancy[cell]
+        if cell == body.first() and not eats:
+            occupancy -= 1
+        tail = body[0] if eats or len(body) == 1 else body[1]
+        return occupancy == 0 or (cell == tail and occupancy == 1)
+
+    def _reaches_tail(self, state, start, cell, tail):
+        """Check whether the tail can be reached from a cell through free cells, after the head moved there.
+
+        Args:
+            state (GameState): The game to play.
+            start (int): The cell the head moves from.
+            cell (int): The cell the head moves to.
+            tail (int): The tail cell once the head reaches `start`.
+
+        Returns:
+            bool: Whether there is a path from `cell` to a cell next to the tail.
+        """
+        if cell == tail or state.game_mode == "Peaceful":
+            return True
+
+        neighbors = self._neighbors
+        occupancy = state.occupancy
+        visited = {start, cell}
+        queue = deque([cell])
+        while queue:
+            for neighbor in neighbors[queue.popleft()]:
+                if neighbor == tail:
+                    return True
+                if neighbor not in visited and occupancy[neighbor] == 0:
+                    visited.add(neighbor)
+                    queue.append(neighbor)
+
+        return False
+
+    def _orientation_to(self, state, start, cell):
+        """Get the direction of a move between neighboring cells.
+
+        Args:
+            state (GameState): The game to play.
+            start (int): The cell to move from.
+            cell (int): The neighboring cell to move to.
+
+        Returns:
+            tuple: The direction (dx, dy).
+        """
+        for orientation in ORIENTATIONS:
+            if _next_cell(state.board_dimensions, self._wraps, start, orientation) == cell:
+                return orientation
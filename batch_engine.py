@@ -0,0 +1,266 @@
+import numpy as np
+
+from engine import (EVENT_ATE_FRUIT, EVENT_COLLIDED_BORDER, EVENT_COLLIDED_SELF, EVENT_WON, INITIAL_SNAKE_SIZE,
+                    ORIENTATIONS, RIGHT)
+
+# Actions are indices into ACTIONS, or NO_ACTION to keep going
+ACTIONS = ORIENTATIONS
+NO_ACTION = -1
+
+_DIRECTION_X = np.array([orientation[0] for orientation in ACTIONS])
+_DIRECTION_Y = np.array([orientation[1] for orientation in ACTIONS])
+_REVERSE_ACTION = np.array([ACTIONS.index((-dx, -dy)) for dx, dy in ACTIONS])
+
+
+class BatchGame:
+    """Many games with the same settings, stored as NumPy arrays and advanced together.
+
+    Follows the same rules as engine.step(), one action per game per tick. Each snake body is a ring buffer of
+    cell indices (y * board_width + x), so moving a snake only writes its new head and forgets its tail.
+
+    Attributes:
+        num_games (int): The number of games in the batch.
+        board_dimensions (tuple): Number of grid cells (columns, rows).
+        game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+        num_fruits (int): Number of fruits on each board.
+        rng (numpy.random.Generator): The random number generator used to place fruits.
+        body (ndarray): Ring buffers of snake cell indices, shape (num_games, capacity).
+        head_index (ndarray): Position of each snake's head in its ring buffer.
+        length (ndarray): Number of segments of each snake.
+        occupancy (ndarray): Number of snake segments on each cell, shape (num_games, num_cells).
+        occupied_cells (ndarray): Number of distinct cells covered by each snake.
+        fruits (ndarray): Cell index of each fruit, or -1 for none, shape (num_games, num_fruits).
+        direction (ndarray): The current movement direction of each snake, as an index into ACTIONS.
+        was_moved (ndarray): Whether each snake has made its initial move.
+        score (ndarray): The number of fruits eaten in each game.
+        game_over (ndarray): Whether each game has ended. Finished games are left untouched by step().
+        game_won (ndarray): Whether each game ended by filling the board.
+    """
+
+    def __init__(self, num_games, board_dimensions, game_mode, num_fruits, seed=None):
+        """Initialize the batch with every game at its starting position.
+
+        Args:
+            num_games (int): The number of games in the batch.
+            board_dimensions (tuple): Number of grid cells (columns, rows).
+            game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+            num_fruits (int): Number of fruits on each board.
+            seed (int or None): Seed for the fruit placement.
+        """
+        self.num_games = num_games
+        self.board_dimensions = board_dimensions
+        self.game_mode = game_mode
+        self.num_fruits = num_fruits
+        self.rng = np.random.default_rng(seed)
+
+        num_cells = board_dimensions[0] * board_dimensions[1]
+        capacity = num_cells + 1
+        self.body = np.zeros((num_games, capacity), dtype=np.int32)
+        self.head_index = np.zeros(num_games, dtype=np.int64)
+        self.length = np.zeros(num_games, dtype=np.int64)
+        self.occupancy = np.zeros((num_games, num_cells), dtype=np.uint16)
+        self.occupied_cells = np.zeros(num_games, dtype=np.int64)
+        self.fruits = np.full((num_games, num_fruits), -1, dtype=np.int32)
+        self.direction = np.zeros(num_games, dtype=np.int64)
+        self.was_moved = np.zeros(num_games, dtype=bool)
+        self.score = np.zeros(num_games, dtype=np.int64)
+        self.game_over = np.zeros(num_games, dtype=bool)
+        self.game_won = np.zeros(num_games, dtype=bool)
+
+        self.reset()
+
+    @property
+    def capacity(self):
+        """int: The number of segments each ring buffer can hold before it must be enlarged."""
+        return self.body.shape[1]
+
+    def reset(self, games=None):
+        """Put games back at their starting position, with new fruits.
+
+        Args:
+            games (ndarray or None): Boolean mask of the games to reset, or None for all of them.
+        """
+        if games is None:
+            games = np.arange(self.num_games)
+        else:
+            games = np.flatnonzero(games)
+
+        width, height = self.board_dimensions
+        snake_x = int(width * 0.15)
+        snake_y = height // 2
+        initial_cells = snake_y * width + snake_x + np.arange(INITIAL_SNAKE_SIZE)
+
+        self.body[games] = 0
+        self.body[games, :INITIAL_SNAKE_SIZE] = initial_cells
+        self.head_index[games] = INITIAL_SNAKE_SIZE - 1
+        self.length[games] = INITIAL_SNAKE_SIZE
+        self.occupancy[games] = 0
+        self.occupancy[np.ix_(games, initial_cells)] = 1
+        self.occupied_cells[games] = INITIAL_SNAKE_SIZE
+        self.fruits[games] = -1
+        self.direction[games] = ACTIONS.index(RIGHT)
+        self.was_moved[games] = False
+        self.score[games] = 0
+        self.game_over[games] = False
+        self.game_won[games] = False
+
+        for slot in range(self.num_fruits):
+            self._spawn_fruits(games, np.full(len(games), slot))
+
+    def body_cells(self, game):
+        """Get the snake of one game.
+
+        Args:
+            game (int): The index of the game in the batch.
+
+        Returns:
+            list: The cell indices of the snake segments, from the tail to the head.
+        """
+        tail_index = self.head_index[game] - self.length[game] + 1
+        positions = np.arange(tail_index, self.head_index[game] + 1) % self.capacity
+        return self.body[game, positions].tolist()
+
+    def free_cell_counts(self):
+        """Count the cells not covered by the snake or a fruit in every game.
+
+        Returns:
+            ndarray: The number of free cells of each game.
+        """
+        num_cells = self.occupancy.shape[1]
+        return num_cells - self.occupied_cells - (self.fruits >= 0).sum(axis=1)
+
+    def _spawn_fruits(self, games, slots):
+        """Spawn a fruit at a random unoccupied cell in each of the given games.
+
+        Args:
+            games (ndarray): The indices of the games to spawn a fruit in.
+            slots (ndarray): For each game, the fruit slot to put the new fruit in.
+
+        Returns:
+            ndarray: Boolean mask telling, for each game, whether there was space for the fruit.
+        """
+        free = self.occupancy[games] == 0
+        fruits = self.fruits[games]
+        rows, columns = np.nonzero(fruits >= 0)
+        free[rows, fruits[rows, columns]] = False
+
+        free_counts = free.sum(axis=1)
+        spawned = free_counts > 0
+
+        # Pick the n-th free cell of each board, with n uniformly random
+        picks = (self.rng.random(len(games)) * free_counts).astype(np.int64)
+        cells = np.argmax(np.cumsum(free, axis=1) > picks[:, None], axis=1)
+
+        self.fruits[games, slots] = np.where(spawned, cells, -1)
+        return spawned
+
+    def _enlarge(self):
+        """Double the capacity of the body ring buffers, unrolling them so each tail is at position 0."""
+        capacity = self.capacity
+        tail_index = (self.head_index - self.length + 1) % capacity
+        positions = (tail_index[:, None] + np.arange(capacity)) % capacity
+
+        body = np.zeros((self.num_games, capacity * 2), dtype=self.body.dtype)
+        body[:, :capacity] = np.take_along_axis(self.body, positions, axis=1)
+        self.body = body
+        self.head_index = self.length - 1
+
+    def step(self, actions=None):
+        """Advance every unfinished game by one tick.
+
+        Args:
+            actions (array-like or None): For each game, an index into ACTIONS to steer towards, or NO_ACTION
+                                          to keep going. None keeps every snake going.
+
+        Returns:
+            dict: For each of the EVENT_* constants, a boolean array telling which games it happened in.
+        """
+        width, height = self.board_dimensions
+        events = {event: np.zeros(self.num_games, dtype=bool) for event in
+                  (EVENT_ATE_FRUIT, EVENT_WON, EVENT_COLLIDED_BORDER, EVENT_COLLIDED_SELF)}
+
+        # Apply the actions as engine.orient() would. One action per tick means nothing stays queued between ticks,
+        # so a turn is kept aside until the current move is done.
+        if actions is None:
+            actions = np.full(self.num_games, NO_ACTION)
+        actions = np.asarray(actions)
+        has_action = (actions != NO_ACTION) & ~self.game_over
+        reverse = _REVERSE_ACTION[self.direction]
+
+        starting = has_action & ~self.was_moved & (actions != reverse)
+        turning = has_action & self.was_moved & (actions != self.direction) & (actions != reverse)
+        self.direction[starting] = actions[starting]
+        self.was_moved |= starting
+        next_direction = np.where(turning, actions, self.direction)
+
+        # Move the snakes
+        games = np.flatnonzero(self.was_moved & ~self.game_over)
+        head_index = self.head_index[games]
+        head = self.body[games, head_index]
+        direction = self.direction[games]
+        new_x = head % width + _DIRECTION_X[direction]
+        new_y = head // width + _DIRECTION_Y[direction]
+
+        # Handle collision with border
+        if self.game_mode == "Infinite" or self.game_mode == "Peaceful":
+            new_x %= width
+            new_y %= height
+            border = np.zeros(len(games), dtype=bool)
+        else:
+            border = (new_x < 0) | (new_x >= width) | (new_y < 0) | (new_y >= height)
+        new_head = np.where(border, 0, new_y * width + new_x)
+
+        # Handle collision with self, ignoring the tail cell that is vacated in this same move
+        tail_index = (head_index - self.length[games] + 1) % self.capacity
+        tail = self.body[games, tail_index]
+        if self.game_mode != "Peaceful":
+            occupied_counts = self.occupancy[games, new_head].astype(np.int64) - (new_head == tail)
+            collided_self = ~border & (occupied_counts > 0)
+        else:
+            collided_self = np.zeros(len(games), dtype=bool)
+
+        events[EVENT_COLLIDED_BORDER][games[border]] = True
+        events[EVENT_COLLIDED_SELF][games[collided_self]] = True
+        self.game_over[games[border | collided_self]] = True
+
+        moved = ~(border | collided_self)
+        games = games[moved]
+        tail = tail[moved]
+        new_head = new_head[moved]
+
+        self.occupancy[games, tail] -= 1
+        self.occupied_cells[games] -= self.occupancy[games, tail] == 0
+        self.head_index[games] = (self.head_index[games] + 1) % self.capacity
+        self.body[games, self.head_index[games]] = new_head
+        self.occupancy[games, new_head] += 1
+        self.occupied_cells[games] += self.occupancy[games, new_head] == 1
+        self.direction[games] = next_direction[games]
+
+        # Collision detection with fruits
+        eaten = self.fruits[games] == new_head[:, None]
+        ate = eaten.any(axis=1)
+        games = games[ate]
+        slots = np.argmax(eaten[ate], axis=1)
+
+        self.fruits[games, slots] = -1
+        self.score[games] += 1
+        events[EVENT_ATE_FRUIT][games] = True
+
+        spawned = self._spawn_fruits(games, slots)
+        won = ~spawned & ~(self.fruits[games] >= 0).any(axis=1)
+        events[EVENT_WON][games[won]] = True
+        self.game_over[games[won]] = True
+        self.game_won[games[won]] = True
+
+        # Grow the snakes that ate by duplicating their tail segment
+        games = games[~won]
+        if len(games) and self.length[games].max() >= self.capacity:
+            self._enlarge()
+        tail_index = (self.head_index[games] - self.length[games] + 1) % self.capacity
+        tail = self.body[games, tail_index]
+        self.body[games, (tail_index - 1) % self.capacity] = tail
+        self.length[games] += 1
+        self.occupancy[games, tail] += 1
+
+        return events
+
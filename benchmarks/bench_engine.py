@@ -0,0 +1,38 @@
+from benchmarks.common import BOARD_SIZES, FILL_FRACTIONS, make_state, measure, snake_length
+from engine import move, spawn_fruit
+
+
+def bench_move():
+    """Time engine.move(), which moves the snake one cell, by board size and snake length.
+
+    Returns:
+        dict: The measure() results, keyed by benchmark name.
+    """
+    results = {}
+    for board_size in BOARD_SIZES:
+        for fraction in FILL_FRACTIONS:
+            state = make_state(board_size, snake_length(board_size, fraction))
+            results[f"move/{board_size}/filled={fraction:.0%}"] = measure(lambda: move(state), number=50000)
+    return results
+
+
+def bench_spawn_fruit():
+    """Time engine.spawn_fruit() by board size and the fraction of the board covered by the snake.
+
+    The fruit is removed again after each spawn, so every call sees the same board.
+
+    Returns:
+        dict: The measure() results, keyed by benchmark name.
+    """
+    results = {}
+    for board_size in BOARD_SIZES:
+        for fraction in FILL_FRACTIONS:
+            state = make_state(board_size, snake_length(board_size, fraction))
+
+            def spawn_and_remove():
+                cell = spawn_fruit(state)
+                state.fruits.pop()
+                state.free_cells.release(cell)
+
+            results[f"spawn_fruit/{board_size}/filled={fraction:.0%}"] = measure(spawn_and_remove, number=50000)
+    return results
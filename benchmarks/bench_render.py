@@ -0,0 +1,80 @@
+import pygame
+
+from benchmarks.common import BOARD_SIZES, FILL_FRACTIONS, SCROLLING_BOARD_SIZES, make_state, measure, snake_length
+from camera import Camera
+from constants import BOARD_HEIGHT, BOARD_WIDTH, SNAKE_COLOR_RED, STATUS_BAR_HEIGHT
+from snake import Snake
+
+
+def _offscreen_game(game, board_size):
+    """Set a game up to draw a board size on an offscreen surface.
+
+    Args:
+        game (Game): The game, created with the dummy video driver.
+        board_size (str): The board size option ("Small", "Medium", "Large", "Extra Large", "Huge", "Gigantic").
+    """
+    game.settings["board_size"]["selected_option"] = board_size
+    game._update_game_settings()
+    game.screen = pygame.Surface((BOARD_WIDTH, BOARD_HEIGHT + STATUS_BAR_HEIGHT))
+
+
+def bench_snake_draw(game):
+    """Time drawing the snake mid-move with each renderer, by board size and snake length.
+
+    Args:
+        game (Game): The game to draw with, created with the dummy video driver.
+
+    Returns:
+        dict: The measure() results, keyed by benchmark name.
+    """
+    results = {}
+    for board_size in BOARD_SIZES:
+        _offscreen_game(game, board_size)
+        for fraction in FILL_FRACTIONS:
+            snake = Snake(game, make_state(board_size, snake_length(board_size, fraction)), SNAKE_COLOR_RED)
+            name = f"{board_size}/filled={fraction:.0%}"
+            results[f"snake_draw/{name}"] = measure(lambda: snake.draw(0.5), number=200)
+            results[f"snake_draw_rects/{name}"] = measure(lambda: snake.draw(0.5, return_rects=True), number=200)
+            results[f"snake_draw_static_body/{name}"] = measure(lambda: snake.draw_with_static_body(0.5), number=200)
+    return results
+
+
+def bench_grass(game):
+    """Time drawing the grass background cell by cell, and blitting the pre-rendered one, by board size.
+
+    Args:
+        game (Game): The game to draw with, created with the dummy video driver.
+
+    Returns:
+        dict: The measure() results, keyed by benchmark name.
+    """
+    results = {}
+    for board_size in BOARD_SIZES:
+        _offscreen_game(game, board_size)
+        results[f"draw_grass/{board_size}"] = measure(game._draw_grass, number=200)
+        results[f"blit_grass/{board_size}"] = measure(lambda: game.screen.blit(game._get_grass_surface(), (0, 0)),
+                                                      number=200)
+    return results
+
+
+def bench_scrolling_draw(game):
+    """Time drawing the part of a board larger than the screen that is in view, by board size and snake length.
+
+    Args:
+        game (Game): The game to draw with, created with the dummy video driver.
+
+    Returns:
+        dict: The measure() results, keyed by benchmark name.
+    """
+    results = {}
+    for board_size in SCROLLING_BOARD_SIZES:
+        _offscreen_game(game, board_size)
+        for fraction in (0.0, 0.25):
+            state = make_state(board_size, snake_length(board_size, fraction))
+            snake = Snake(game, state, SNAKE_COLOR_RED)
+            camera = Camera(state.board_dimensions, game.cell_size, (BOARD_WIDTH, BOARD_HEIGHT), True)
+            camera.follow(*state.position(state.body.last()))
+            name = f"{board_size}/filled={fraction:.0%}"
+            results[f"draw_visible/{name}"] = measure(lambda: snake.draw_visible(0.5, camera), number=200)
+        results[f"draw_grass_in_view/{board_size}"] = measure(lambda: game._draw_grass_in_view(camera), number=200)
+    return results
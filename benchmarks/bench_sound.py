@@ -0,0 +1,24 @@
+from benchmarks.common import measure
+from constants import MUNCHING_SOUND, SOUNDS, UP_SOUND
+from utils import assets_loaded, play_sound, wait_for_assets
+
+
+def bench_play_sound(game):
+    """Time starting a sound effect with play_sound(), on the dummy audio driver.
+
+    Waits for the sounds to load first, as play_sound() skips the sounds played before they are ready.
+
+    Args:
+        game (Game): The game to play sounds for, created with the dummy audio driver.
+
+    Returns:
+        dict: The measure() results, keyed by benchmark name.
+    """
+    game.sfx_enabled = True
+    wait_for_assets()
+    assert assets_loaded(), "the sounds could not be loaded"
+    return {
+        "play_sound/munching"   : measure(lambda: play_sound(game, MUNCHING_SOUND), number=2000),
+        "play_sound/direction"  : measure(lambda: play_sound(game, UP_SOUND), number=2000),
+        "play_sound/all_effects": measure(lambda: [play_sound(game, path) for path in SOUNDS], number=500),
+    }
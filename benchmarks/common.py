@@ -0,0 +1,102 @@
+import gc
+import os
+import random
+import statistics
+import time
+
+from engine import INITIAL_SNAKE_SIZE, GameState, board_dimensions_for
+
+BOARD_SIZES = ("Small", "Medium", "Large", "Extra Large")
+SCROLLING_BOARD_SIZES = ("Huge", "Gigantic")
+
+# Fractions of the board covered by the snake in the benchmarks that depend on the snake's length
+FILL_FRACTIONS = (0.0, 0.25, 0.5, 0.9, 0.99)
+
+
+def use_dummy_drivers():
+    """Make SDL use its dummy video and audio drivers, so nothing is shown or played. Must run before pygame.init()."""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+def make_state(board_size, length, game_mode="Peaceful", seed=0):
+    """Create a game with a snake of a given length, laid out row by row from the top left corner of the board.
+
+    The snake moves along the last row it covers, so in Peaceful mode it can keep moving forever.
+
+    Args:
+        board_size (str): The board size option ("Small", "Medium", "Large", "Extra Large", "Huge", "Gigantic").
+        length (int): The number of snake segments, at least 2.
+        game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+        seed (int): Seed of the game's random number generator.
+
+    Returns:
+        GameState: The game, with the snake already moving and no fruits.
+    """
+    state = GameState(board_dimensions_for(board_size), game_mode, random.Random(seed))
+    width = state.board_dimensions[0]
+
+    for i in range(length):
+        y, x = divmod(i, width)
+        if y % 2 == 1:
+            x = width - 1 - x
+        cell = state.cell(x, y)
+        state.body.append(cell)
+        state.occupy(cell)
+        state.entered_at[cell] = i - (length - 1)
+
+    head_x, head_y = state.position(state.body[-1])
+    neck_x, neck_y = state.position(state.body[-2])
+    state.current_orientation = (head_x - neck_x, head_y - neck_y)
+    state.was_moved = True
+    return state
+
+
+def snake_length(board_size, fraction):
+    """Get the length of a snake covering a fraction of a board.
+
+    Args:
+        board_size (str): The board size option ("Small", "Medium", "Large", "Extra Large", "Huge", "Gigantic").
+        fraction (float): The fraction of the board's cells covered by the snake.
+
+    Returns:
+        int: The number of snake segments, at least the initial length of a game.
+    """
+    width, height = board_dimensions_for(board_size)
+    return max(INITIAL_SNAKE_SIZE, int(width * height * fraction))
+
+
+def measure(function, number, repeat=7):
+    """Time a function the way timeit does, with garbage collection disabled while timing.
+
+    Args:
+        function (callable): The function to time, called without arguments.
+        number (int): The number of calls timed together in each run.
+        repeat (int): The number of timed runs, after one untimed warm-up run.
+
+    Returns:
+        dict: The minimum, median, mean and standard deviation of the time per call, in microseconds, over the runs.
+    """
+    function()
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        times = []
+        for _ in range(repeat):
+            start_time = time.perf_counter_ns()
+            for _ in range(number):
+                function()
+            times.append((time.perf_counter_ns() - start_time) / number / 1000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "min"   : min(times),
+        "median": statistics.median(times),
+        "mean"  : statistics.fmean(times),
+        "stdev" : statistics.stdev(times) if len(times) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
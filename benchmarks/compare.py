@@ -0,0 +1,74 @@
+import argparse
+import json
+import sys
+
+
+def compare(baseline, current, threshold, statistic="min"):
+    """Compare the time of every benchmark in two sets of results.
+
+    Args:
+        baseline (dict): The "benchmarks" of the reference results.
+        current (dict): The "benchmarks" of the results to check.
+        threshold (float): The relative slowdown above which a benchmark counts as a regression, e.g. 0.1 for 10%.
+        statistic (str): The statistic of the runs to compare, "min", "median" or "mean". The minimum is the least
+                         affected by other processes.
+
+    Returns:
+        list: A (name, baseline time, current time, relative change, status) tuple for each benchmark in either set,
+              where status is "regression", "improvement", "ok", "new" or "missing".
+    """
+    rows = []
+    for name in list(baseline) + [name for name in current if name not in baseline]:
+        if name not in current:
+            rows.append((name, baseline[name][statistic], None, None, "missing"))
+            continue
+        if name not in baseline:
+            rows.append((name, None, current[name][statistic], None, "new"))
+            continue
+
+        before = baseline[name][statistic]
+        after = current[name][statistic]
+        change = (after - before) / before if before else 0.0
+
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((name, before, after, change, status))
+
+    return rows
+
+
+def main():
+    """Compare benchmark results with a baseline from the command line, exiting with 1 if anything regressed."""
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions against a baseline.")
+    parser.add_argument("baseline", help="results to compare against, written by benchmarks.run")
+    parser.add_argument("current", help="results to check, written by benchmarks.run")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown that counts as a regression (default: 0.1)")
+    parser.add_argument("--statistic", choices=("min", "median", "mean"), default="min",
+                        help="statistic of the timed runs to compare (default: min)")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["benchmarks"]
+    with open(args.current) as f:
+        current = json.load(f)["benchmarks"]
+
+    rows = compare(baseline, current, args.threshold, args.statistic)
+    for name, before, after, change, status in rows:
+        before = "-" if before is None else f"{before:.3f}"
+        after = "-" if after is None else f"{after:.3f}"
+        change = "" if change is None else f"{change:+.1%}"
+        print(f"{name:<48} {before:>12} {after:>12} {change:>8}  {status}")
+
+    num_regressions = sum(row[4] == "regression" for row in rows)
+    print(f"{num_regressions} regression(s) over {args.threshold:.0%} in {len(rows)} benchmarks.", file=sys.stderr)
+    if num_regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+from benchmarks.common import use_dummy_drivers
+
+use_dummy_drivers()
+
+import pygame
+
+from benchmarks.bench_engine import bench_move, bench_spawn_fruit
+from benchmarks.bench_render import bench_grass, bench_scrolling_draw, bench_snake_draw
+from benchmarks.bench_sound import bench_play_sound
+from game import Game
+
+# Benchmark groups, selectable by name, and whether they need a Game to draw or play sounds with
+BENCHMARKS = {
+    "move"       : (bench_move, False),
+    "spawn_fruit": (bench_spawn_fruit, False),
+    "snake_draw" : (bench_snake_draw, True),
+    "grass"      : (bench_grass, True),
+    "scrolling"  : (bench_scrolling_draw, True),
+    "play_sound" : (bench_play_sound, True),
+}
+
+
+def run_benchmarks(names):
+    """Run benchmark groups.
+
+    Args:
+        names (list): The names of the groups to run, from BENCHMARKS.
+
+    Returns:
+        dict: The measure() results of every benchmark in the groups, keyed by benchmark name.
+    """
+    game = None
+    results = {}
+    for name in names:
+        function, needs_game = BENCHMARKS[name]
+        if needs_game:
+            if game is None:
+                game = Game(seed=0)
+            results.update(function(game))
+        else:
+            results.update(function())
+        print(f"Ran {name} benchmarks.", file=sys.stderr)
+    return results
+
+
+def main():
+    """Run the benchmarks from the command line and save the results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark the Snake simulation and rendering hot paths.")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS),
+                        help="benchmark groups to run (default: all)")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="file to write the results to (default: benchmark_results.json)")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.only)
+    data = {
+        "metadata"  : {
+            "time"    : time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python"  : platform.python_version(),
+            "pygame"  : pygame.version.ver,
+            "platform": platform.platform(),
+            "unit"    : "us",
+        },
+        "benchmarks": results,
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(data, f, indent=4)
+
+    for name, result in results.items():
+        print(f"{name:<48} {result['min']:>12.3f} us")
+
+
+if __name__ == "__main__":
+    main()
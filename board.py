@@ -0,0 +1,199 @@
+import random
+from array import array
+
+
+class FreeCells:
+    """An index of the board cells that are not covered by the snake or a fruit.
+
+    Cells are identified by their flat index (y * board_width + x). Free cells are kept in a dense list
+    and removed by swapping with the last element, so taking, releasing and picking a random free cell
+    are all O(1). On boards with more than 65536 cells, the list and the positions are packed arrays instead,
+    which are slower to update but take four bytes per cell, so boards with millions of cells stay small.
+
+    Attributes:
+        cells (list or array): The indices of all free cells, in no particular order.
+        positions (list or array): For each cell index, its position in `cells`, or -1 if the cell is taken.
+    """
+
+    def __init__(self, num_cells):
+        """Initialize the index with every cell of the board free.
+
+        Args:
+            num_cells (int): The total number of cells on the board.
+        """
+        if num_cells > 0xFFFF:
+            self.cells = array("i", range(num_cells))
+            self.positions = array("i", range(num_cells))
+        else:
+            self.cells = list(range(num_cells))
+            self.positions = list(range(num_cells))
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.positions[cell] != -1
+
+    def take(self, cell):
+        """Mark a cell as occupied. Does nothing if the cell is already taken.
+
+        Args:
+            cell (int): The flat index of the cell.
+        """
+        position = self.positions[cell]
+        if position == -1:
+            return
+
+        last_cell = self.cells.pop()
+        if last_cell != cell:
+            self.cells[position] = last_cell
+            self.positions[last_cell] = position
+        self.positions[cell] = -1
+
+    def release(self, cell):
+        """Mark a cell as free. Does nothing if the cell is already free.
+
+        Args:
+            cell (int): The flat index of the cell.
+        """
+        if self.positions[cell] != -1:
+            return
+
+        self.positions[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def choice(self, rng=random):
+        """Pick a random free cell.
+
+        Args:
+            rng: The random number generator to use.
+
+        Returns:
+            int or None: The flat index of a free cell, or None if the board is full.
+        """
+        if not self.cells:
+            return None
+
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class RingBuffer:
+    """A double-ended queue of cell indices stored in a preallocated, packed array.
+
+    Used for the snake body: a move appends the new head and drops the tail without allocating, and each segment
+    takes two bytes (four on boards with more than 65536 cells). The capacity is a power of two, so positions wrap
+    with a bit mask, and it doubles when the buffer is full.
+
+    Attributes:
+        items (array): The packed storage, used circularly.
+        mask (int): The capacity minus one.
+        start (int): The position of the first item in `items`.
+        length (int): The number of items in the buffer.
+    """
+
+    __slots__ = ("items", "mask", "start", "length")
+
+    def __init__(self, capacity, max_value):
+        """Initialize an empty buffer.
+
+        Args:
+            capacity (int): The number of items to preallocate room for, rounded up to a power of two.
+            max_value (int): The largest value that will be stored, which decides the item size.
+        """
+        typecode = "H" if max_value <= 0xFFFF else "I"
+        capacity = 1 << max(capacity - 1, 0).bit_length()
+        self.items = array(typecode, [0]) * capacity
+        self.mask = capacity - 1
+        self.start = 0
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("ring buffer index out of range")
+        return self.items[(self.start + index) & self.mask]
+
+    def __iter__(self):
+        end = self.start + self.length
+        if end <= len(self.items):
+            return iter(self.items[self.start:end])
+        return iter(self.items[self.start:] + self.items[:end - len(self.items)])
+
+    def first(self):
+        """Get the first item, which must exist.
+
+        Returns:
+            int: The first item.
+        """
+        return self.items[self.start]
+
+    def last(self):
+        """Get the last item, which must exist.
+
+        Returns:
+            int: The last item.
+        """
+        return self.items[(self.start + self.length - 1) & self.mask]
+
+    def _enlarge(self):
+        """Double the capacity, moving the items to the start of the new storage."""
+        items = array(self.items.typecode, self)
+        items.extend(array(self.items.typecode, [0]) * len(self.items))
+        self.items = items
+        self.mask = len(items) - 1
+        self.start = 0
+
+    def append(self, value):
+        """Add an item at the end.
+
+        Args:
+            value (int): The item to add.
+        """
+        if self.length > self.mask:
+            self._enlarge()
+        self.items[(self.start + self.length) & self.mask] = value
+        self.length += 1
+
+    def appendleft(self, value):
+        """Add an item at the start.
+
+        Args:
+            value (int): The item to add.
+        """
+        if self.length > self.mask:
+            self._enlarge()
+        self.start = (self.start - 1) & self.mask
+        self.items[self.start] = value
+        self.length += 1
+
+    def advance(self, value):
+        """Remove the first item and add an item at the end, in one operation that never needs to enlarge.
+
+        Args:
+            value (int): The item to add.
+
+        Returns:
+            int: The removed item.
+        """
+        start = self.start
+        removed = self.items[start]
+        self.items[(start + self.length) & self.mask] = value
+        self.start = (start + 1) & self.mask
+        return removed
+
+    def popleft(self):
+        """Remove and return the first item.
+
+        Returns:
+            int: The removed item.
+        """
+        if self.length == 0:
+            raise IndexError("pop from an empty ring buffer")
+        value = self.items[self.start]
+        self.start = (self.start + 1) & self.mask
+        self.length -= 1
+        return value
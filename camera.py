@@ -0,0 +1,98 @@
+class Camera:
+    """The part of a board larger than the screen that is shown on screen, kept centered on the snake's head.
+
+    Positions are in board pixels, counted from the top left corner of the board. On boards that wrap around
+    (Infinite and Peaceful modes) the camera wraps around with the snake, and every position is drawn at its copy
+    nearest to the screen. On other boards the camera stops at the borders, so nothing outside the board is shown.
+
+    Attributes:
+        board_dimensions (tuple): Number of grid cells (columns, rows).
+        cell_size (int): Size of each grid cell in pixels.
+        view_size (tuple): Size (width, height) of the region of the screen the board is shown in, in pixels.
+        wraps (bool): Whether the board wraps around its edges.
+        x (int): The horizontal board pixel shown at the left edge of the screen.
+        y (int): The vertical board pixel shown at the top edge of the screen.
+    """
+
+    __slots__ = ("board_dimensions", "cell_size", "view_size", "wraps", "x", "y", "_board_size")
+
+    def __init__(self, board_dimensions, cell_size, view_size, wraps):
+        """Initialize the camera at the top left corner of the board.
+
+        Args:
+            board_dimensions (tuple): Number of grid cells (columns, rows).
+            cell_size (int): Size of each grid cell in pixels.
+            view_size (tuple): Size (width, height) of the region of the screen the board is shown in, in pixels.
+            wraps (bool): Whether the board wraps around its edges.
+        """
+        self.board_dimensions = board_dimensions
+        self.cell_size = cell_size
+        self.view_size = view_size
+        self.wraps = wraps
+        self.x = 0
+        self.y = 0
+        self._board_size = (board_dimensions[0] * cell_size, board_dimensions[1] * cell_size)
+
+    def follow(self, x, y):
+        """Center the view on a grid position.
+
+        Args:
+            x (float): The x-coordinate on the game grid, which can be between cells while the snake moves.
+            y (float): The y-coordinate on the game grid.
+        """
+        board_width, board_height = self._board_size
+        view_width, view_height = self.view_size
+        left = int((x + 0.5) * self.cell_size) - view_width // 2
+        top = int((y + 0.5) * self.cell_size) - view_height // 2
+
+        if self.wraps:
+            self.x = left % board_width
+            self.y = top % board_height
+        else:
+            self.x = min(max(left, 0), board_width - view_width)
+            self.y = min(max(top, 0), board_height - view_height)
+
+    def to_screen(self, x, y):
+        """Convert a board pixel position to a screen position.
+
+        On boards that wrap around, the copy of the position nearest to the screen is used. Positions up to two
+        cells left of or above the screen stay there instead of wrapping to the far side of the board, so cells
+        sliding into view are drawn in the right place.
+
+        Args:
+            x (int): The horizontal board pixel.
+            y (int): The vertical board pixel.
+
+        Returns:
+            tuple: The screen position (x, y), which can be outside the screen.
+        """
+        x -= self.x
+        y -= self.y
+        if self.wraps:
+            margin = 2 * self.cell_size
+            x = (x + margin) % self._board_size[0] - margin
+            y = (y + margin) % self._board_size[1] - margin
+
+        return x, y
+
+    def visible_cells(self):
+        """Get the grid columns and rows in view, with one more on each side for the cells sliding into view.
+
+        Returns:
+            tuple (list, list): The column indices and the row indices, from the top left of the screen.
+        """
+        width, height = self.board_dimensions
+        view_width, view_height = self.view_size
+        first_column = self.x // self.cell_size - 1
+        last_column = (self.x + view_width - 1) // self.cell_size + 1
+        first_row = self.y // self.cell_size - 1
+        last_row = (self.y + view_height - 1) // self.cell_size + 1
+
+        if self.wraps:
+            columns = [column % width for column in range(first_column, last_column + 1)]
+            rows = [row % height for row in range(first_row, last_row + 1)]
+        else:
+            columns = list(range(max(first_column, 0), min(last_column, width - 1) + 1))
+            rows = list(range(max(first_row, 0), min(last_row, height - 1) + 1))
+
+        return columns, rows
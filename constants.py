@@ -1,19 +1,32 @@
 import os
 import sys
 
-def resource_path(relative_path):
-    """Get the absolute path to a resource."""
+def resource_dir():
+    """Get the absolute path to the directory the resources are in."""
     if hasattr(sys, '_MEIPASS'):
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
+        return sys._MEIPASS
+    return os.path.abspath(".")
+
+def resource_path(relative_path):
+    """Get the absolute path to a resource.
+
+    Open it with asset_pack.open_resource(), which reads it from the asset pack if there is one.
+    """
+    return os.path.join(resource_dir(), relative_path)
+
+ASSET_PACK_FILE = resource_path("assets.pack")
 
 FPS = 60
+MAX_TICKS_PER_FRAME = 5  # Most simulation ticks run to catch up in a single frame
+MAX_SKIPPED_FRAMES = 5  # Most frames in a row left undrawn while the simulation catches up
+MENU_EVENT_TIMEOUT = 500  # Most milliseconds a menu sleeps waiting for an event
 
 # Colors for the game board and UI
 LIGHT_GRASS_COLOR = (165, 207, 82)
 DARK_GRASS_COLOR = (155, 193, 77)
 UI_COLOR = (74, 117, 44)
 BLACK = (0, 0, 0)
+STATIC_BODY_LAYER_COLOR_KEY = (255, 0, 255)  # Transparent color of the snake's static body layer, never a snake color
 WHITE = (255, 255, 255)
 
 FONT_FACE_REGULAR = resource_path("fonts/PixelifySans-Regular.ttf")
@@ -30,6 +43,19 @@ DOWN_SOUND = resource_path("sounds/down.wav")
 RIGHT_SOUND = resource_path("sounds/right.wav")
 LEFT_SOUND = resource_path("sounds/left.wav")
 
+# Every sound effect and the volume (0.0 to 1.0) it is played at
+SOUNDS = {
+    CLICK_SOUND    : 1.0,
+    MUNCHING_SOUND : 1.0,
+    COLLISION_SOUND: 1.0,
+    WIN_SOUND      : 1.0,
+    UP_SOUND       : 0.4,
+    DOWN_SOUND     : 0.4,
+    RIGHT_SOUND    : 0.4,
+    LEFT_SOUND     : 0.4,
+}
+CHANNELS_PER_SOUND = 3  # Mixer channels reserved for each sound effect, so that many of its plays can overlap
+
 # Board dimensions should be multiples of 72.
 BOARD_WIDTH = 288
 BOARD_HEIGHT = 432
@@ -41,6 +67,24 @@ CELL_SIZE_MEDIUM = 24
 CELL_SIZE_LARGE = 18
 CELL_SIZE_EXTRA_LARGE = 12
 
+# Cell size of each board size option
+CELL_SIZES = {
+    "Small"      : CELL_SIZE_SMALL,
+    "Medium"     : CELL_SIZE_MEDIUM,
+    "Large"      : CELL_SIZE_LARGE,
+    "Extra Large": CELL_SIZE_EXTRA_LARGE,
+    "Huge"       : CELL_SIZE_EXTRA_LARGE,
+    "Gigantic"   : CELL_SIZE_EXTRA_LARGE,
+}
+
+# Number of grid cells (columns, rows) of the board size options that are larger than the screen. The screen shows
+# the part of the board around the snake's head. The numbers of columns and rows are even, so the checkerboard grass
+# repeats across the edges of boards that wrap around.
+SCROLLING_BOARD_DIMENSIONS = {
+    "Huge"    : (240, 360),
+    "Gigantic": (960, 1440),
+}
+
 SNAKE_COLOR_RED = (255, 0, 0)
 SNAKE_COLOR_BLUE = (0, 0, 255)
 SNAKE_COLOR_ORANGE = (255, 180, 0)
@@ -0,0 +1,110 @@
+from autopilot import Autopilot
+from engine import ORIENTATIONS
+
+
+def _next_cell(state, cell, orientation):
+    """Get the cell the snake would reach by moving from a cell in a direction.
+
+    Args:
+        state (GameState): The game the snake is in.
+        cell (int): The cell index to move from.
+        orientation (tuple): The movement direction (dx, dy).
+
+    Returns:
+        int or None: The cell index reached, or None if the move leaves the board in Regular mode.
+    """
+    width, height = state.board_dimensions
+    y, x = divmod(cell, width)
+    x += orientation[0]
+    y += orientation[1]
+
+    if state.game_mode == "Infinite" or state.game_mode == "Peaceful":
+        x %= width
+        y %= height
+    elif not (0 <= x < width and 0 <= y < height):
+        return None
+
+    return y * width + x
+
+
+def _distance(state, cell, other_cell):
+    """Get the number of moves between two cells, ignoring the snake.
+
+    Args:
+        state (GameState): The game the cells are in.
+        cell (int): The first cell index.
+        other_cell (int): The second cell index.
+
+    Returns:
+        int: The Manhattan distance between the cells, wrapping around the edges outside Regular mode.
+    """
+    width, height = state.board_dimensions
+    y, x = divmod(cell, width)
+    other_y, other_x = divmod(other_cell, width)
+    dx = abs(x - other_x)
+    dy = abs(y - other_y)
+
+    if state.game_mode == "Infinite" or state.game_mode == "Peaceful":
+        dx = min(dx, width - dx)
+        dy = min(dy, height - dy)
+
+    return dx + dy
+
+
+def random_controller(state):
+    """Turn in a random direction now and then.
+
+    Args:
+        state (GameState): The game to play.
+
+    Returns:
+        tuple or None: The direction to steer towards, or None to keep going.
+    """
+    if not state.was_moved or state.rng.random() < 0.2:
+        return state.rng.choice(ORIENTATIONS)
+    return None
+
+
+def greedy_controller(state):
+    """Head for the nearest fruit, avoiding moves that end the game on the spot.
+
+    A direction change only applies after the move in progress, so the plan starts from the cell the snake is
+    about to reach.
+
+    Args:
+        state (GameState): The game to play.
+
+    Returns:
+        tuple or None: The direction to steer towards, or None to keep going.
+    """
+    if state.was_moved:
+        start = _next_cell(state, state.body[-1], state.current_orientation)
+        if start is None:
+            return None
+    else:
+        start = state.body[-1]
+
+    best_orientation = None
+    best_distance = None
+    for orientation in ORIENTATIONS:
+        if orientation == (-state.current_orientation[0], -state.current_orientation[1]):
+            continue
+
+        cell = _next_cell(state, start, orientation)
+        if cell is None or (state.game_mode != "Peaceful" and state.occupancy[cell] != 0):
+            continue
+
+        distance = min((_distance(state, cell, fruit) for fruit in state.fruits), default=0)
+        if best_distance is None or distance < best_distance:
+            best_orientation = orientation
+            best_distance = distance
+
+    return best_orientation
+
+
+# Built-in controllers, selectable by name
+CONTROLLERS = {
+    "random": random_controller,
+    "greedy": greedy_controller,
+    "autopilot": Autopilot(),
+}
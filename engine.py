@@ -0,0 +1,323 @@
+import math
+import random
+from array import array
+from collections import deque
+
+from board import FreeCells, RingBuffer
+from constants import BOARD_HEIGHT, BOARD_WIDTH, CELL_SIZES, SCROLLING_BOARD_DIMENSIONS
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+ORIENTATIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Events reported by step()
+EVENT_ATE_FRUIT = "ate_fruit"
+EVENT_WON = "won"
+EVENT_COLLIDED_BORDER = "border"
+EVENT_COLLIDED_SELF = "self"
+
+INITIAL_SNAKE_SIZE = 4
+
+
+class GameState:
+    """The complete state of a single game, independent of pygame.
+
+    Board cells are identified by their flat index (y * board_width + x) and orientations are (dx, dy) tuples.
+    A game is advanced one tick at a time with step().
+
+    Attributes:
+        board_dimensions (tuple): Number of grid cells (columns, rows).
+        game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+        rng: The random number generator used to place fruits.
+        body (RingBuffer): The cell indices of the snake segments, from the tail to the head.
+        occupancy (bytearray): Number of snake segments on each cell.
+        entered_at (array): For each cell, the value of `moves` when the snake's head last entered it. The segment
+                            with that value is `moves - entered_at[cell]` segments behind the head.
+        free_cells (FreeCells): Index of the cells not covered by the snake or a fruit.
+        current_orientation (tuple): The current movement direction (dx, dy).
+        next_orientations (deque): A queue of upcoming direction changes.
+        was_moved (bool): Whether the snake has made its initial move.
+        moves (int): The number of moves the snake has made.
+        fruits (list): The cell indices of the fruits on the board.
+        score (int): The number of fruits eaten.
+        game_over (bool): Whether the game has ended.
+        game_won (bool): Whether the game ended by filling the board.
+    """
+
+    def __init__(self, board_dimensions, game_mode, rng=random):
+        """Initialize an empty board.
+
+        Args:
+            board_dimensions (tuple): Number of grid cells (columns, rows).
+            game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+            rng: The random number generator used to place fruits.
+        """
+        self.board_dimensions = board_dimensions
+        self.game_mode = game_mode
+        self.rng = rng
+
+        num_cells = board_dimensions[0] * board_dimensions[1]
+        self.body = RingBuffer(num_cells + 1, num_cells - 1)
+        self.occupancy = bytearray(num_cells)
+        self.entered_at = array("q", [0]) * num_cells
+        self.free_cells = FreeCells(num_cells)
+        self.current_orientation = RIGHT
+        self.next_orientations = deque()
+        self.was_moved = False
+        self.moves = 0
+        self.fruits = []
+        self.score = 0
+        self.game_over = False
+        self.game_won = False
+
+    def cell(self, x, y):
+        """Convert a grid position to a cell index.
+
+        Args:
+            x (int): The x-coordinate on the game grid.
+            y (int): The y-coordinate on the game grid.
+
+        Returns:
+            int: The flat cell index.
+        """
+        return y * self.board_dimensions[0] + x
+
+    def position(self, cell):
+        """Convert a cell index to a grid position.
+
+        Args:
+            cell (int): The flat cell index.
+
+        Returns:
+            tuple: The grid position (x, y).
+        """
+        y, x = divmod(cell, self.board_dimensions[0])
+        return x, y
+
+    def occupy(self, cell):
+        """Add a snake segment to a cell, taking it from the free cells if it was empty.
+
+        Args:
+            cell (int): The flat cell index.
+        """
+        if self.occupancy[cell] == 0:
+            self.free_cells.take(cell)
+        self.occupancy[cell] += 1
+
+    def vacate(self, cell):
+        """Remove a snake segment from a cell, returning it to the free cells if it becomes empty.
+
+        Args:
+            cell (int): The flat cell index.
+        """
+        self.occupancy[cell] -= 1
+        if self.occupancy[cell] == 0:
+            self.free_cells.release(cell)
+
+
+def board_dimensions_for(board_size):
+    """Get the number of grid cells of a board size option.
+
+    Args:
+        board_size (str): The board size option ("Small", "Medium", "Large", "Extra Large", "Huge", "Gigantic").
+
+    Returns:
+        tuple: Number of grid cells (columns, rows).
+    """
+    if board_size in SCROLLING_BOARD_DIMENSIONS:
+        return SCROLLING_BOARD_DIMENSIONS[board_size]
+
+    cell_size = CELL_SIZES[board_size]
+    return BOARD_WIDTH // cell_size, BOARD_HEIGHT // cell_size
+
+
+def new_game(board_dimensions, game_mode, num_fruits, rng=random):
+    """Create a game with the snake in its starting position and the fruits spawned.
+
+    Args:
+        board_dimensions (tuple): Number of grid cells (columns, rows).
+        game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+        num_fruits (int): Number of fruits on the board.
+        rng: The random number generator used to place fruits.
+
+    Returns:
+        GameState: The new game.
+    """
+    state = GameState(board_dimensions, game_mode, rng)
+
+    snake_x = math.floor(board_dimensions[0] * 0.15)
+    snake_y = math.floor(board_dimensions[1] / 2)
+    for i in range(INITIAL_SNAKE_SIZE):
+        cell = state.cell(snake_x + i, snake_y)
+        state.body.append(cell)
+        state.occupy(cell)
+        state.entered_at[cell] = i - (INITIAL_SNAKE_SIZE - 1)
+
+    for _ in range(num_fruits):
+        spawn_fruit(state)
+
+    return state
+
+
+def spawn_fruit(state):
+    """Spawn a fruit at a random unoccupied cell.
+
+    Args:
+        state (GameState): The game to spawn the fruit in.
+
+    Returns:
+        int or None: The cell index of the new fruit, or None if no space is available.
+    """
+    cell = state.free_cells.choice(state.rng)
+    if cell is None:
+        return None
+
+    state.free_cells.take(cell)
+    state.fruits.append(cell)
+    return cell
+
+
+def orient(state, orientation):
+    """Set the snake's movement direction.
+
+    Ignores invalid moves (reversing direction, and same direction), then queues the direction changes.
+
+    Args:
+        state (GameState): The game to steer.
+        orientation (tuple): The desired movement direction (dx, dy).
+
+    Returns:
+        list: The direction changes that were accepted, in order. There can be two when the first move both
+              starts the snake and queues a turn.
+    """
+    accepted = []
+    reverse = (-orientation[0], -orientation[1])
+
+    if not state.was_moved:
+        if reverse == state.current_orientation:
+            # Prevent the snake from going backwards
+            return accepted
+
+        state.current_orientation = orientation
+        state.was_moved = True
+        accepted.append(orientation)
+
+    # Prevent the snake from moving backwards or registering a forward move by checking the current orientation or
+    # the last queued orientation.
+    if len(state.next_orientations) == 0:
+        if orientation == state.current_orientation or reverse == state.current_orientation:
+            return accepted
+    else:
+        if orientation == state.next_orientations[-1] or reverse == state.next_orientations[-1]:
+            return accepted
+
+    state.next_orientations.append(orientation)
+    accepted.append(orientation)
+    return accepted
+
+
+def move(state):
+    """Move the snake one step in its current direction.
+
+    Checks for collisions with borders or the snake itself based on game mode.
+    Updates the snake's position and applies the next queued direction.
+
+    Args:
+        state (GameState): The game to advance.
+
+    Returns:
+        tuple (bool, str or None): the bool indicates whether the move is successful,
+                                   and the str indicates the collision type ("border" or "self") if applicable.
+    """
+    width, height = state.board_dimensions
+    head = state.body.last()
+    new_x = head % width + state.current_orientation[0]
+    new_y = head // width + state.current_orientation[1]
+
+    # Handle collision with border
+    if state.game_mode == "Infinite" or state.game_mode == "Peaceful":
+        new_x %= width
+        new_y %= height
+    elif not (0 <= new_x < width and 0 <= new_y < height):
+        return False, EVENT_COLLIDED_BORDER
+
+    new_head = new_y * width + new_x
+
+    # Handle collision with self. The tail cell is vacated in this same move, so it only counts
+    # if another segment (e.g. a duplicate left by grow()) still covers it.
+    if state.game_mode != "Peaceful":
+        occupied_count = state.occupancy[new_head]
+        if new_head == state.body.first():
+            occupied_count -= 1
+        if occupied_count > 0:
+            return False, EVENT_COLLIDED_SELF
+
+    # Update the snake's position by removing the tail and adding a new head in the current direction
+    state.vacate(state.body.advance(new_head))
+    state.occupy(new_head)
+    state.moves += 1
+    state.entered_at[new_head] = state.moves
+    if len(state.next_orientations) != 0:
+        state.current_orientation = state.next_orientations.popleft()
+
+    return True, None
+
+
+def grow(state):
+    """Increase the snake's length by duplicating the tail segment.
+
+    Args:
+        state (GameState): The game to update.
+    """
+    tail = state.body.first()
+    state.body.appendleft(tail)
+    state.occupy(tail)
+
+
+def step(state, action=None):
+    """Advance the game by one tick.
+
+    Applies the action as a call to orient(), then moves the snake and lets it eat a fruit it landed on.
+    Nothing moves until the snake has been given its first direction, as in the interactive game.
+
+    Args:
+        state (GameState): The game to advance. It is updated in place.
+        action (tuple or None): A movement direction (dx, dy) to steer towards, or None to keep going.
+
+    Returns:
+        tuple (GameState, list): The updated state and the events (EVENT_* constants) that happened in this tick.
+    """
+    events = []
+    if state.game_over:
+        return state, events
+
+    if action is not None:
+        orient(state, action)
+
+    if not state.was_moved:
+        return state, events
+
+    is_move_successful, reason = move(state)
+    if not is_move_successful:
+        state.game_over = True
+        events.append(reason)
+        return state, events
+
+    # Collision detection with fruits
+    head = state.body.last()
+    if head in state.fruits:
+        state.fruits.remove(head)
+        state.score += 1
+        events.append(EVENT_ATE_FRUIT)
+
+        if spawn_fruit(state) is None and len(state.fruits) == 0:
+            state.game_over = True
+            state.game_won = True
+            events.append(EVENT_WON)
+            return state, events
+
+        grow(state)
+
+    return state, events
@@ -11,6 +11,8 @@ class Fruit:
         color: The RGB color tuple for rendering the fruit.
     """
 
+    __slots__ = ("game", "pos", "color")
+
     def __init__(self, game, tile_x, tile_y, color):
         """Initialize a fruit at the specified grid position.
 
@@ -24,14 +26,22 @@ class Fruit:
         self.pos = Vector2(tile_x, tile_y)
         self.color = color
 
-    def draw(self):
+    def draw(self, camera=None):
         """Draw the fruit on the game screen.
 
         Converts the grid position to pixel coordinates and renders a filled rectangle with the fruit's color.
+
+        Args:
+            camera (Camera or None): The camera the board is seen through, on boards larger than the screen.
+
+        Returns:
+            pygame.Rect: The region of the screen that was drawn on.
         """
         x = self.pos.x * self.game.cell_size
         y = self.pos.y * self.game.cell_size
+        if camera is not None:
+            x, y = camera.to_screen(x, y)
 
         fruit_rect = pygame.Rect(x, y, self.game.cell_size, self.game.cell_size)
 
-        pygame.draw.rect(self.game.screen, self.color, fruit_rect)
+        return pygame.draw.rect(self.game.screen, self.color, fruit_rect)
@@ -1,10 +1,17 @@
 import json
-import math
 import random
+import time
+from collections import deque
 
-from pygame import Vector2
-
+from autopilot import Autopilot
+from camera import Camera
+from engine import (DOWN, EVENT_ATE_FRUIT, EVENT_COLLIDED_BORDER, EVENT_COLLIDED_SELF, EVENT_WON, LEFT, RIGHT, UP,
+                    new_game, step)
 from fruit import Fruit
+from persistence import DATA_FILE, HIGH_SCORE_SETTINGS, DataWriter, high_score_key
+from profiler import PROFILE_CSV_FILE, PROFILE_JSON_FILE, FrameProfiler
+from replay import REPLAY_FILE, Recording
+from score_history import SCORE_HISTORY_FILE, ScoreHistory
 from snake import Snake
 from utils import *
 
@@ -20,25 +27,49 @@ class Game:
         num_fruits (int): Number of fruits to spawn.
         snake_speed (int): Snake movement speed (moves per second).
         game_mode (str): Current game mode ("Regular", "Infinite", "Peaceful").
+        autopilot_enabled (bool): Whether the snake is steered by an Autopilot instead of the player.
         sfx_enabled (bool): Whether sound effects are enabled.
+        dirty_rects_enabled (bool): Whether the game scene only redraws and updates the regions that changed.
+        static_body_enabled (bool): Whether the snake is drawn with only its head and tail interpolated.
+        profiler (FrameProfiler): Times the parts of each frame of the game scene.
+        profiler_overlay_enabled (bool): Whether the frame timings are shown over the board, toggled with F3.
         viewport_width (int): Width of the game window.
         viewport_height (int): Height of the game window.
         board_dimensions (tuple): Number of grid cells (columns, rows).
         game_won (bool): Whether the player has won the game.
         score (int): Current player score.
-        high_scores (dict): High scores for different game configurations.
+        score_history (ScoreHistory): Every finished game, for the high score of each game configuration.
+        last_game (dict): The duration, snake length and seed of the last finished game.
+        grass_surface: Cached pre-rendered grass background, or None if it must be rebuilt.
         screen: Pygame surface for rendering.
         clock: Pygame clock for controlling frame rate.
+        fps (int): The most frames per second drawn in the game scene, 0 for no limit.
+        vsync (bool): Whether the display waits for the monitor's vertical sync.
+        profile_startup (bool): Whether to print the startup timings once the first frame is shown.
+        startup_timings (dict): Seconds spent on each step of starting the game, in order.
+        rng (random.Random): Random number generator that picks the seed of each game.
     """
 
-    def __init__(self):
-        """Initialize the game with default settings and Pygame setup."""
+    def __init__(self, seed=None, fps=FPS, vsync=False, profile_startup=False):
+        """Initialize the game with default settings and Pygame setup.
+
+        Args:
+            seed (int or None): Seed that makes the sequence of games reproducible. None picks a random one.
+            fps (int): The most frames per second drawn in the game scene, 0 for no limit. The snake moves at the
+                       same speed at any frame rate.
+            vsync (bool): Whether to wait for the monitor's vertical sync when updating the display, which also
+                          limits the frame rate to the monitor's refresh rate.
+            profile_startup (bool): Whether to print how long each step of starting the game took, once the first
+                                    frame is shown.
+        """
+        self.startup_timings = {}
+        self._startup_step_start_time = time.perf_counter()
 
         # Initialize settings dictionary
         self.settings = {
             "board_size" : {
                 "label"          : "Board Size",
-                "options"        : ["Small", "Medium", "Large", "Extra Large"],
+                "options"        : ["Small", "Medium", "Large", "Extra Large", "Huge", "Gigantic"],
                 "selected_option": "Medium"
             },
             "snake_color": {
@@ -66,10 +97,20 @@ class Game:
                 "options"        : ["Regular", "Infinite", "Peaceful"],
                 "selected_option": "Regular"
             },
+            "player"     : {
+                "label"          : "Player",
+                "options"        : ["You", "Autopilot"],
+                "selected_option": "You"
+            },
             "sfx_enabled": {
                 "label"          : "SFX Enabled",
                 "options"        : ["Yes", "No"],
                 "selected_option": "Yes"
+            },
+            "render_mode": {
+                "label"          : "Renderer",
+                "options"        : ["Full Redraw", "Dirty Rects", "Static Body"],
+                "selected_option": "Full Redraw"
             }
         }
 
@@ -80,7 +121,14 @@ class Game:
         self.num_fruits = 1
         self.snake_speed = SNAKE_SPEED_MODERATE
         self.game_mode = "Regular"
+        self.autopilot_enabled = False
         self.sfx_enabled = True
+        self.dirty_rects_enabled = False
+        self.static_body_enabled = False
+        self.profiler = FrameProfiler()
+        self.profiler_overlay_enabled = False
+        self._profiler_overlay_surface = None
+        self._profiler_overlay_frame = None  # The profiler frame count the overlay surface was rendered at
 
         # Viewport and grid
         self.viewport_width = BOARD_WIDTH
@@ -92,47 +140,135 @@ class Game:
         # Initialize game state
         self.game_won = False
         self.score = 0
-        self.high_scores = {}
+        self.last_game = {}
+        self.grass_surface = None
+        self._grass_surface_key = None
+        self.rng = random.Random(seed)
+        self.fps = fps
+        self.vsync = vsync
+        self.profile_startup = profile_startup
 
         # Load saved settings and high scores
+        self._data_writer = DataWriter(DATA_FILE)
+        self._replay_writer = DataWriter(REPLAY_FILE)
+        self._profile_json_writer = DataWriter(PROFILE_JSON_FILE)
+        self._profile_csv_writer = DataWriter(PROFILE_CSV_FILE)
+        self._legacy_high_scores = {}  # High scores found in DATA_FILE, imported into a new score history
         self._load_data()
+        self.score_history = ScoreHistory(SCORE_HISTORY_FILE, self._legacy_high_scores)
         self._update_game_settings()
-
-        # Initialize Pygame
-        self.screen = pygame.display.set_mode((self.viewport_width, self.viewport_height))
+        self._record_startup_step("settings")
+
+        # Initialize only the Pygame modules the first frame needs. The sounds are loaded in the background while the
+        # first frame is shown, and the fonts on first use.
+        pygame.display.init()
+        pygame.font.init()
+        self._record_startup_step("pygame init")
+
+        if self.vsync:
+            try:
+                self.screen = pygame.display.set_mode((self.viewport_width, self.viewport_height), pygame.SCALED,
+                                                      vsync=1)
+            except pygame.error as e:
+                print(f"VSync is not available: {e}")
+                self.vsync = False
+        if not self.vsync:
+            self.screen = pygame.display.set_mode((self.viewport_width, self.viewport_height))
         self.clock = pygame.time.Clock()
+        self._record_startup_step("display")
 
-        pygame.mixer.init()
-        pygame.init()
+        start_loading_assets()
+        self._record_startup_step("mixer")
+
+    def _record_startup_step(self, step):
+        """Record how long a step of starting the game took, since the previous step ended.
+
+        Args:
+            step (str): The name of the step.
+        """
+        end_time = time.perf_counter()
+        self.startup_timings[step] = end_time - self._startup_step_start_time
+        self._startup_step_start_time = end_time
+
+    def _report_startup(self):
+        """Print the startup timings, once the first frame has been shown and the assets have been loaded."""
+        self._record_startup_step("first frame")
+        wait_for_assets()
+
+        print("Startup timings:")
+        for step, seconds in self.startup_timings.items():
+            print(f"  {step:<16}{seconds * 1000:8.1f} ms")
+        print(f"  {'total':<16}{sum(self.startup_timings.values()) * 1000:8.1f} ms")
+        print("Loaded in the background:")
+        for step, seconds in asset_load_timings.items():
+            print(f"  {step:<16}{seconds * 1000:8.1f} ms")
+
+        self.profile_startup = False
 
     def _save_data(self):
-        """Save game settings and high scores to a JSON file."""
+        """Save game settings to DATA_FILE.
+
+        The file is written in the background, so this returns without waiting for the disk. High scores are kept
+        in `score_history`.
+        """
 
         data = {
-            "settings"   : {setting_key: setting_data["selected_option"] for setting_key, setting_data in
-                            self.settings.items()},
-            "high_scores": {str(k): v for k, v in self.high_scores.items()}  # Convert frozenset keys to strings
+            "settings": {setting_key: setting_data["selected_option"] for setting_key, setting_data in
+                         self.settings.items()},
         }
 
-        with open('game_data.json', 'w') as f:
-            json.dump(data, f)
+        self._data_writer.save(data)
 
     def _load_data(self):
-        """Load game settings and high scores from a JSON file.
+        """Load game settings from DATA_FILE, and the high scores saved in it by older versions.
 
-        If the file is missing or invalid, default values are retained.
+        If the file is missing or invalid, default values are retained. The high scores are kept in
+        `_legacy_high_scores`, keyed by high_score_key(), to be imported into the score history. Keys in the string
+        form of a frozenset of options are converted.
         """
         try:
-            with open('game_data.json', 'r') as f:
+            with open(DATA_FILE, 'r') as f:
                 data = json.load(f)
                 for setting_key, value in data["settings"].items():
                     self.settings[setting_key]["selected_option"] = value
-                self.high_scores = {frozenset(k[12:-2].replace("'", "").split(", ")): v for k, v in
-                                    data["high_scores"].items()}
+                for key, high_score in data.get("high_scores", {}).items():
+                    if key.startswith("frozenset("):
+                        key = self._convert_legacy_high_score_key(key)
+                        if key is None:
+                            continue
+                    self._legacy_high_scores[key] = max(high_score, self._legacy_high_scores.get(key, high_score))
         except (FileNotFoundError, json.JSONDecodeError, KeyError):
             # If file doesn't exist or is invalid, keep default values
             pass
 
+    def _convert_legacy_high_score_key(self, legacy_key):
+        """Convert a high score key saved by older versions to a high_score_key().
+
+        Args:
+            legacy_key (str): The string form of a frozenset of options, e.g. "frozenset({'One', 'Medium', ...})".
+
+        Returns:
+            str or None: The high_score_key() of the same game configuration, or None if the key is not valid.
+        """
+        options = {option.strip().strip("'") for option in legacy_key[len("frozenset({"):-len("})")].split(",")}
+
+        selected_options = {}
+        for setting_key in HIGH_SCORE_SETTINGS:
+            matches = options.intersection(self.settings[setting_key]["options"])
+            if len(matches) != 1:
+                return None
+            selected_options[setting_key] = matches.pop()
+
+        return high_score_key(selected_options)
+
+    def _get_game_config(self):
+        """Get the selected game configuration, which has its own high score.
+
+        Returns:
+            dict: The selected option of every setting in HIGH_SCORE_SETTINGS, keyed by setting.
+        """
+        return {setting_key: self.settings[setting_key]["selected_option"] for setting_key in HIGH_SCORE_SETTINGS}
+
     def _update_game_settings(self):
         """Update game parameters based on current settings."""
 
@@ -142,7 +278,9 @@ class Game:
         setting_num_fruits = self.settings["num_fruits"]["selected_option"]
         setting_snake_speed = self.settings["snake_speed"]["selected_option"]
         setting_game_mode = self.settings["game_mode"]["selected_option"]
+        setting_player = self.settings["player"]["selected_option"]
         setting_sfx_enabled = self.settings["sfx_enabled"]["selected_option"]
+        setting_render_mode = self.settings["render_mode"]["selected_option"]
 
         # Update board size
         if setting_board_size == "Small":
@@ -153,11 +291,21 @@ class Game:
             self.cell_size = CELL_SIZE_LARGE
         elif setting_board_size == "Extra Large":
             self.cell_size = CELL_SIZE_EXTRA_LARGE
+        elif setting_board_size == "Huge":
+            self.cell_size = CELL_SIZE_EXTRA_LARGE
+        elif setting_board_size == "Gigantic":
+            self.cell_size = CELL_SIZE_EXTRA_LARGE
 
         # Recalculate grid dimensions
-        board_num_cells_x_direction = BOARD_WIDTH // self.cell_size
-        board_num_cells_y_direction = BOARD_HEIGHT // self.cell_size
-        self.board_dimensions = (board_num_cells_x_direction, board_num_cells_y_direction)
+        if setting_board_size in SCROLLING_BOARD_DIMENSIONS:
+            self.board_dimensions = SCROLLING_BOARD_DIMENSIONS[setting_board_size]
+        else:
+            board_num_cells_x_direction = BOARD_WIDTH // self.cell_size
+            board_num_cells_y_direction = BOARD_HEIGHT // self.cell_size
+            self.board_dimensions = (board_num_cells_x_direction, board_num_cells_y_direction)
+
+        # The grass background depends on the board size, so it must be rebuilt
+        self.grass_surface = None
 
         # Update snake color
         if setting_snake_color == "Red":
@@ -209,67 +357,172 @@ class Game:
         elif setting_game_mode == "Peaceful":
             self.game_mode = "Peaceful"
 
+        # Update player
+        if setting_player == "You":
+            self.autopilot_enabled = False
+        elif setting_player == "Autopilot":
+            self.autopilot_enabled = True
+
         # Update sfx settings
         if setting_sfx_enabled == "Yes":
             self.sfx_enabled = True
         elif setting_sfx_enabled == "No":
             self.sfx_enabled = False
 
-    def _spawn_fruit(self, snake, existing_fruits):
-        """Spawn a fruit at a random unoccupied grid position.
+        # Update render mode
+        if setting_render_mode == "Full Redraw":
+            self.dirty_rects_enabled = False
+            self.static_body_enabled = False
+        elif setting_render_mode == "Dirty Rects":
+            self.dirty_rects_enabled = True
+            self.static_body_enabled = False
+        elif setting_render_mode == "Static Body":
+            self.dirty_rects_enabled = False
+            self.static_body_enabled = True
+
+    def _create_fruits(self, state):
+        """Create a renderable Fruit for every fruit on the board.
 
         Args:
-            snake (Snake): The snake object to avoid spawning on.
-            existing_fruits (list): List of existing fruits to avoid spawning on.
+            state (GameState): The state of the running game.
 
         Returns:
-            Fruit or None: A new Fruit instance, or None if no space is available.
+            list: A Fruit instance for each fruit in the game state.
         """
-        all_positions = [(x, y) for x in range(self.board_dimensions[0]) for y in range(self.board_dimensions[1])]
-        occupied_positions = set((int(pos.x), int(pos.y)) for pos in snake.body)
-        for fruit in existing_fruits:
-            occupied_positions.add((int(fruit.pos.x), int(fruit.pos.y)))
+        return [Fruit(self, *state.position(cell), self.fruit_color) for cell in state.fruits]
 
-        available_positions = [pos for pos in all_positions if pos not in occupied_positions]
+    def _is_board_scrolling(self):
+        """Check whether the board is larger than the screen, so it is seen through a Camera.
 
-        if not available_positions:
-            return None
+        Returns:
+            bool: Whether the board is wider or taller than the screen.
+        """
+        return (self.board_dimensions[0] * self.cell_size > BOARD_WIDTH
+                or self.board_dimensions[1] * self.cell_size > BOARD_HEIGHT)
 
-        tile_x, tile_y = random.choice(available_positions)
-        return Fruit(self, tile_x, tile_y, self.fruit_color)
+    def _draw_grass(self, surface=None):
+        """Draw the checkerboard grass background cell by cell.
 
-    def _draw_grass(self):
-        """Draw the checkerboard grass background."""
+        Only the cells that fit on the surface are drawn, so on boards larger than the screen the cost depends on
+        the size of the surface, not on the size of the board.
 
-        for col in range(self.board_dimensions[0]):
-            for row in range(self.board_dimensions[1]):
+        Args:
+            surface: The Pygame surface to draw on. Defaults to the screen.
+        """
+        if surface is None:
+            surface = self.screen
+
+        num_columns = min(self.board_dimensions[0], -(-surface.get_width() // self.cell_size))
+        num_rows = min(self.board_dimensions[1], -(-surface.get_height() // self.cell_size))
+        for col in range(num_columns):
+            for row in range(num_rows):
                 if (col + row) % 2 == 0:
                     dark_rect = pygame.Rect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
-                    pygame.draw.rect(self.screen, DARK_GRASS_COLOR, dark_rect)
+                    pygame.draw.rect(surface, DARK_GRASS_COLOR, dark_rect)
+
+    def _get_grass_surface(self):
+        """Get the pre-rendered grass background, rendering it if the board size changed.
+
+        On boards larger than the screen, the surface is two cells wider and taller than the screen. The
+        checkerboard repeats every two cells, so any part of the board is drawn by blitting the surface with an
+        offset, see _draw_grass_in_view().
+
+        Returns:
+            pygame.Surface: A board-sized surface with the light grass and the dark checkerboard cells.
+        """
+        key = (self.cell_size, self.board_dimensions)
+        if self.grass_surface is None or self._grass_surface_key != key:
+            if self._is_board_scrolling():
+                size = (BOARD_WIDTH + 2 * self.cell_size, BOARD_HEIGHT + 2 * self.cell_size)
+            else:
+                size = (BOARD_WIDTH, BOARD_HEIGHT)
+            self.grass_surface = pygame.Surface(size).convert()
+            self.grass_surface.fill(LIGHT_GRASS_COLOR)
+            self._draw_grass(self.grass_surface)
+            self._grass_surface_key = key
+
+        return self.grass_surface
+
+    def _draw_grass_in_view(self, camera):
+        """Draw the grass under the part of a board larger than the screen that is in view.
+
+        Args:
+            camera (Camera): The camera the board is seen through.
+        """
+        period = 2 * self.cell_size
+        self.screen.blit(self._get_grass_surface(), (0, 0),
+                         (camera.x % period, camera.y % period, BOARD_WIDTH, BOARD_HEIGHT))
 
     def _draw_status_bar(self):
-        """Draw the status bar with the current score."""
+        """Draw the status bar with the current score.
+
+        Returns:
+            pygame.Rect: The region of the screen covered by the status bar.
+        """
 
         status_bar_rect = pygame.Rect(0, BOARD_HEIGHT, self.viewport_width, STATUS_BAR_HEIGHT)
         pygame.draw.rect(self.screen, UI_COLOR, status_bar_rect)
 
-        font = pygame.font.Font(FONT_FACE_BOLD, 35)
-        score_txt = font.render(str(self.score), False, WHITE)
+        font = get_font(FONT_FACE_BOLD, 35)
+        score_txt = render_text(str(self.score), font, WHITE)
         x, y = center(score_txt.get_rect(), status_bar_rect)
 
         self.screen.blit(score_txt, (x, y))
 
+        return status_bar_rect
+
+    def _draw_profiler_overlay(self):
+        """Draw the p50/p95/p99 frame timings of each profiled section at the bottom left of the board.
+
+        The timings are rendered again at most twice per second, so the overlay is readable and cheap to draw.
+
+        Returns:
+            pygame.Rect: The region of the screen covered by the overlay.
+        """
+        frame = self.profiler.num_frames
+        if self._profiler_overlay_surface is None or frame - self._profiler_overlay_frame >= FPS // 2:
+            font = get_font(FONT_FACE_REGULAR, 14)
+            line_height = font.get_linesize()
+            column_width = 50
+            rows = [("us", "p50", "p95", "p99")]
+            for section, percentiles in self.profiler.summary().items():
+                rows.append((section,) + tuple(f"{percentiles[p]:.0f}" if p in percentiles else "-"
+                                               for p in ("p50", "p95", "p99")))
+
+            label_width = max(font.size(row[0])[0] for row in rows) + 10
+            surface = pygame.Surface((label_width + 3 * column_width + 10, len(rows) * line_height + 10),
+                                     pygame.SRCALPHA)
+            surface.fill((0, 0, 0, 160))
+            for i, row in enumerate(rows):
+                y = 5 + i * line_height
+                # The labels and the header are the same every time, so they come from the text cache. The timings
+                # change, and are rendered afresh so they do not fill it.
+                surface.blit(render_text(row[0], font, WHITE), (5, y))
+                for j, cell in enumerate(row[1:]):
+                    text = render_text(cell, font, WHITE) if i == 0 else font.render(cell, False, WHITE)
+                    surface.blit(text, (label_width + (j + 1) * column_width - text.get_width(), y))
+
+            self._profiler_overlay_surface = surface
+            self._profiler_overlay_frame = frame
+
+        overlay_rect = self._profiler_overlay_surface.get_rect(bottomleft=(0, BOARD_HEIGHT))
+        self.screen.blit(self._profiler_overlay_surface, overlay_rect)
+
+        return overlay_rect
+
     # Scenes
     def _main_menu_scene(self):
         """Display and handle the main menu scene.
 
+        The menu is drawn once, then the scene sleeps until there is an event to handle.
+
         Returns:
             str: The next scene to transition to ("game_scene", "options_menu_scene").
         """
         self.screen.fill(LIGHT_GRASS_COLOR)
         render_title(self.screen, "Main Menu")
 
-        btn_font = pygame.font.Font(FONT_FACE_BOLD, 25)
+        btn_font = get_font(FONT_FACE_BOLD, 25)
 
         play_btn_rect = render_centered_text(self.screen, "Play", btn_font, 0, -50, BLACK)
         options_btn_rect = render_centered_text(self.screen, "Options", btn_font, 0, 0, BLACK)
@@ -277,10 +530,15 @@ class Game:
 
         pygame.display.update()
 
+        if self.profile_startup:
+            self._report_startup()
+
         while True:
-            for event in pygame.event.get():
+            for event in wait_for_events():
                 if event.type == pygame.QUIT:
                     exit_game()
+                elif event.type == pygame.WINDOWEXPOSED:
+                    pygame.display.update()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
                         play_sound(self, CLICK_SOUND)
@@ -296,10 +554,31 @@ class Game:
                         play_sound(self, CLICK_SOUND)
                         exit_game()
 
+    def _draw_option_select_btn(self, index, setting_key):
+        """Draw the select button of a setting in the options menu.
+
+        Args:
+            index (int): The position of the setting in the menu.
+            setting_key (str): The key of the setting in `settings`.
+
+        Returns:
+            pygame.Rect: The rectangle of the select button.
+        """
+        selected_option_font = get_font(FONT_FACE_BOLD, 21)
+        label_font = get_font(FONT_FACE_BOLD, 15)
+
+        select_btn_width = 200
+        select_btn_margin_rl = (self.viewport_width - select_btn_width) / 2
+
+        setting = self.settings[setting_key]
+        return render_select_btn(self.screen, select_btn_margin_rl, 92 + index * 41, select_btn_width,
+                                 setting["selected_option"], selected_option_font, setting["label"], label_font)
+
     def _options_menu_scene(self):
         """Display and handle the options menu scene.
 
-        Allows players to configure game settings.
+        Allows players to configure game settings. The menu is drawn once, then the scene sleeps until there is an
+        event to handle, and only the select button of a setting that changed is drawn and updated again.
 
         Returns:
             str: The next scene to transition to ("game_scene", "main_menu_scene").
@@ -308,38 +587,28 @@ class Game:
         self.screen.fill(LIGHT_GRASS_COLOR)
         render_title(self.screen, "Options")
 
-        btn_font = pygame.font.Font(FONT_FACE_BOLD, 25)
-        selected_option_font = pygame.font.Font(FONT_FACE_BOLD, 21)
-        label_font = pygame.font.Font(FONT_FACE_BOLD, 15)
-
-        select_btn_width = 200
-        select_btn_margin_rl = (self.viewport_width - select_btn_width) / 2
+        btn_font = get_font(FONT_FACE_BOLD, 25)
 
         save_btn_rect = render_centered_text(self.screen, "Save", btn_font, 0, 214, BLACK)
 
+        select_btn_rects = {}
+        for i, setting_key in enumerate(self.settings):
+            select_btn_rects[setting_key] = self._draw_option_select_btn(i, setting_key)
+
         pygame.display.update()
 
         while True:
-            self.clock.tick(FPS)
-
-            select_btn_rects = {}
-            for i, (setting_key, setting) in enumerate(self.settings.items()):
-                label = setting["label"]
-                selected_option = setting["selected_option"]
-
-                select_btn_rect = render_select_btn(self.screen, select_btn_margin_rl, 100 + i * 51, select_btn_width,
-                                                    selected_option, selected_option_font, label, label_font)
-                select_btn_rects[setting_key] = select_btn_rect
-
-            for event in pygame.event.get():
+            for event in wait_for_events():
                 if event.type == pygame.QUIT:
                     exit_game()
+                elif event.type == pygame.WINDOWEXPOSED:
+                    pygame.display.update()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
                         play_sound(self, CLICK_SOUND)
                         return "game_scene"
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    for setting_key, select_rect in select_btn_rects.items():
+                    for i, (setting_key, select_rect) in enumerate(select_btn_rects.items()):
                         if select_rect.collidepoint(event.pos):
                             prev_selected_option = self.settings[setting_key]["selected_option"]
                             prev_selected_option_index = self.settings[setting_key]["options"].index(
@@ -349,6 +618,7 @@ class Game:
                             self.settings[setting_key]["selected_option"] = self.settings[setting_key]["options"][
                                 new_selected_option_index]
                             play_sound(self, CLICK_SOUND)
+                            pygame.display.update(self._draw_option_select_btn(i, setting_key))
                             break
                     if save_btn_rect.collidepoint(event.pos):
                         self._save_data()
@@ -356,136 +626,385 @@ class Game:
                         play_sound(self, CLICK_SOUND)
                         return "main_menu_scene"
 
-            pygame.display.update()
-
     def _game_scene(self):
+        """Run the main game loop, with the event queue only letting through the events the game handles.
+
+        Other events, such as mouse motion, key releases and text input, are dropped before they are queued, so
+        they never delay the key presses behind them.
+
+        Returns:
+            str: The next scene to transition to ("main_menu_scene", "game_over_scene").
+        """
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN])
+        try:
+            return self._play_game()
+        finally:
+            pygame.event.set_allowed(None)
+
+    def _play_game(self):
         """Run the main game loop.
 
-        Manages snake movement, fruit collection, and game over conditions.
+        Manages snake movement, fruit collection, and game over conditions. The game is driven by a count of
+        simulation ticks and seeded from `rng`, and the player's inputs are recorded against the tick they arrived
+        at. The recording is saved to REPLAY_FILE when the game ends, so it can be replayed exactly.
+
+        Between frames, the loop sleeps on the event queue until the next frame or the next tick is due, so every
+        turn is timestamped as it is pressed and ticks run on time rather than at the next frame. A turn is given
+        to the snake just before the first tick that was due after it was pressed, even when a frame runs several
+        ticks to catch up. The delays from each turn to the tick that takes it and to the first frame showing that
+        tick are added to the profiler's LATENCIES.
+
+        Every frame is timed by `profiler`, and the timings are saved to PROFILE_JSON_FILE and PROFILE_CSV_FILE
+        when the game ends.
+
+        Boards larger than the screen are seen through a Camera that follows the snake's head, and only what is
+        in view is drawn. The renderer setting does not apply to them, since the whole view moves every frame.
+
+        When the autopilot is enabled, it starts the snake and chooses its direction just before every tick, and
+        the keys only steer the game itself (ESC and F3). The time each decision takes is added to the profiler's
+        "decision" latency.
 
         Returns:
             str: The next scene to transition to ("main_menu_scene", "game_over_scene").
         """
         self.game_won = False
-        snake_x = math.floor(self.board_dimensions[0] * 0.15)
-        snake_y = math.floor(self.board_dimensions[1] / 2)
-        snake = Snake(self, snake_x, snake_y, 4, Vector2(1, 0), self.snake_color)
-
-        fruits = []
-        for _ in range(self.num_fruits):
-            new_fruit = self._spawn_fruit(snake, fruits)
-            fruits.append(new_fruit)
+        recording = Recording(self.board_dimensions, self.game_mode, self.num_fruits, self.rng.randrange(2 ** 32))
+        state = recording.new_game()
+        tick = 0  # Number of simulation ticks run so far
+        snake = Snake(self, state, self.snake_color)
+        fruits = self._create_fruits(state)
+        profiler = self.profiler = FrameProfiler()
+        autopilot = Autopilot() if self.autopilot_enabled else None
 
         self.score = 0  # reset score
 
         snake_move_timer = 0.0  # Time elapsed since the last move
         move_interval = 1 / self.snake_speed  # Move snake every n seconds.
+        skipped_frames = 0  # Number of frames in a row that were not drawn
+        frame_timer = 0.0  # Time elapsed since the last frame was drawn
+        frame_interval = 1 / self.fps if self.fps else 0.0
+        frame_started = False  # Whether the profiler is timing a frame, which lasts until the frame is drawn
+
+        pending_turns = deque()  # (timestamp, orientation) of the turns not given to the snake yet, oldest first
+        turns_awaiting_tick = []  # Timestamps of the turns given to the snake, until the next tick takes them
+        turns_awaiting_display = []  # Timestamps of the turns taken by a tick, until a frame shows it
+
+        camera = None
+        if self._is_board_scrolling():
+            camera = Camera(self.board_dimensions, self.cell_size, (BOARD_WIDTH, BOARD_HEIGHT),
+                            self.game_mode != "Regular")
+
+        # Dirty rect rendering state
+        dirty_rects_enabled = self.dirty_rects_enabled and camera is None
+        board_rect = pygame.Rect(0, 0, BOARD_WIDTH, BOARD_HEIGHT)
+        prev_board_rects = []  # Regions of the board drawn over in the previous frame
+        drawn_score = None  # The score currently shown in the status bar, None if it must be drawn
 
         while True:
-            dt = self.clock.tick(FPS) / 1000.0  # Elapsed time since last frame in seconds
+            # Sleep until the next frame or the next tick is due, whichever comes first
+            timeout = frame_interval - frame_timer
+            if snake.was_moved:
+                timeout = min(timeout, move_interval - snake_move_timer)
+            timed_events = wait_for_timestamped_events(timeout)
+
+            dt = self.clock.tick() / 1000.0  # Elapsed time since the last wake-up in seconds
+            now = time.perf_counter()
+            if frame_started:
+                profiler.skip()  # Leave the sleep out of the frame
+            else:
+                profiler.start_frame()
+                frame_started = True
 
-            for event in pygame.event.get():
+            for timestamp, event in timed_events:
                 if event.type == pygame.QUIT:
                     exit_game()
                 elif event.type == pygame.KEYDOWN:
+                    orientation = None
                     if event.key == pygame.K_ESCAPE:
+                        self._save_recording(recording, state, tick)
+                        self._save_profile()
                         return "main_menu_scene"
+                    elif event.key == pygame.K_F3:
+                        self.profiler_overlay_enabled = not self.profiler_overlay_enabled
+                        drawn_score = None  # Redraw the whole screen to clear the overlay
                     elif event.key == pygame.K_w or event.key == pygame.K_UP:
-                        snake.orient(Vector2(0, -1))
+                        orientation = UP
                     elif event.key == pygame.K_s or event.key == pygame.K_DOWN:
-                        snake.orient(Vector2(0, 1))
+                        orientation = DOWN
                     elif event.key == pygame.K_a or event.key == pygame.K_LEFT:
-                        snake.orient(Vector2(-1, 0))
+                        orientation = LEFT
                     elif event.key == pygame.K_d or event.key == pygame.K_RIGHT:
-                        snake.orient(Vector2(1, 0))
+                        orientation = RIGHT
+
+                    if orientation is not None and autopilot is None:
+                        pending_turns.append((timestamp, orientation))
+
+            if autopilot is not None and not snake.was_moved:
+                self._steer_with_autopilot(autopilot, snake, state, recording, tick)
+            profiler.mark("input")
 
             snake_move_timer += dt
+            frame_timer += dt
             if not snake.was_moved:
                 snake_move_timer = 0
 
-            # If enough time has passed, move the snake to the next grid position
-            if snake_move_timer >= move_interval:
+            # Run a simulation tick for every move interval that has passed, up to MAX_TICKS_PER_FRAME, so the snake
+            # keeps its speed when frames take longer than a move
+            ticks_this_frame = 0
+            while snake_move_timer >= move_interval and ticks_this_frame < MAX_TICKS_PER_FRAME:
                 if snake.was_moved:
-                    is_snake_move_successful, reason = snake.move()
-                    if not is_snake_move_successful:
+                    if autopilot is not None:
+                        self._steer_with_autopilot(autopilot, snake, state, recording, tick)
+                    else:
+                        # The turns pressed before this tick was due are taken by it, and later ones by the next
+                        # ticks
+                        tick_due_time = now - snake_move_timer + move_interval
+                        self._give_turns(snake, recording, tick, pending_turns, tick_due_time, turns_awaiting_tick)
+
+                    state, events = step(state)
+                    tick += 1
+                    self.score = state.score
+                    self._add_latencies("input_to_tick", turns_awaiting_tick, turns_awaiting_display)
+                    profiler.mark("move")
+
+                    if state.game_over:
+                        self._save_recording(recording, state, tick)
+                        self._save_profile()
+                        self.last_game = {"duration": tick / self.snake_speed, "length": len(state.body),
+                                          "seed": recording.seed}
+
+                    if EVENT_WON in events:
+                        self.game_won = True
+                        play_sound(self, WIN_SOUND)
+                        return "game_over_scene"
+                    elif EVENT_COLLIDED_BORDER in events or EVENT_COLLIDED_SELF in events:
                         if self.sfx_enabled:
                             play_sound(self, COLLISION_SOUND)
-                        if reason == "border":
+                        if EVENT_COLLIDED_BORDER in events:
                             print("Game over by collision with map border.")
-                        elif reason == "self":
+                        elif EVENT_COLLIDED_SELF in events:
                             print("Game over by collision with self.")
 
                         return "game_over_scene"
-
-                    # Collision detection with fruits
-                    for fruit in fruits[:]:
-                        if snake.body[-1] == fruit.pos:
-                            fruits.remove(fruit)
-                            self.score += 1
-                            new_fruit = self._spawn_fruit(snake, fruits)
-
-                            if new_fruit is not None:
-                                fruits.append(new_fruit)
-                            else:
-                                if len(fruits) == 0:
-                                    self.game_won = True
-                                    play_sound(self, WIN_SOUND)
-                                    return "game_over_scene"
-
-                            snake.grow()
-                            play_sound(self, MUNCHING_SOUND)
-                            break
+                    elif EVENT_ATE_FRUIT in events:
+                        fruits = self._create_fruits(state)
+                        play_sound(self, MUNCHING_SOUND)
+                        profiler.mark("fruit")
 
                 snake_move_timer -= move_interval  # Subtract the interval to preserve any excess time
+                ticks_this_frame += 1
 
-            snake_interpolation_fraction = snake_move_timer / move_interval  # A value between 0 and 1, indicating progress towards the next move
+            # The turns pressed after the last tick are taken by the next one
+            self._give_turns(snake, recording, tick, pending_turns, now, turns_awaiting_tick)
+            profiler.mark("input")
 
-            # Drawing
-            self.screen.fill(LIGHT_GRASS_COLOR)
-            self._draw_grass()
+            # Only draw when the next frame is due, not when waking up for a tick
+            if frame_timer < frame_interval:
+                continue
+            frame_timer = min(frame_timer - frame_interval, frame_interval)
 
-            for fruit in fruits:
-                fruit.draw()
+            # Skip drawing while the simulation is behind, so the next frames have more time to catch up. After
+            # MAX_SKIPPED_FRAMES frames in a row, draw anyway and drop the time that could not be caught up.
+            if snake_move_timer >= move_interval:
+                if skipped_frames < MAX_SKIPPED_FRAMES:
+                    skipped_frames += 1
+                    profiler.end_frame()
+                    frame_started = False
+                    continue
+                snake_move_timer %= move_interval
+            skipped_frames = 0
 
-            if snake.was_moved:
-                snake.draw(snake_interpolation_fraction)
+            # A value between 0 and 1, indicating progress towards the next move
+            snake_interpolation_fraction = snake_move_timer / move_interval
+
+            if not snake.was_moved:
+                snake_interpolation_fraction = 0
+
+            # Drawing
+            if dirty_rects_enabled and drawn_score is not None:
+                self._draw_game_dirty_rects(snake, fruits, snake_interpolation_fraction, board_rect,
+                                            prev_board_rects, drawn_score != self.score)
             else:
-                snake.draw(0)
+                if camera is not None:
+                    head_x, head_y = state.position(state.body.last())
+                    camera.follow(head_x + snake_interpolation_fraction * state.current_orientation[0],
+                                  head_y + snake_interpolation_fraction * state.current_orientation[1])
+                    self._draw_grass_in_view(camera)
+                else:
+                    self.screen.blit(self._get_grass_surface(), (0, 0))
+                profiler.mark("grass")
+
+                for fruit in fruits:
+                    fruit.draw(camera)
+                profiler.mark("fruit")
+
+                if camera is not None:
+                    snake.draw_visible(snake_interpolation_fraction, camera)
+                elif dirty_rects_enabled:
+                    self.screen.set_clip(board_rect)
+                    prev_board_rects = snake.draw(snake_interpolation_fraction, return_rects=True)
+                    self.screen.set_clip(None)
+                elif self.static_body_enabled:
+                    snake.draw_with_static_body(snake_interpolation_fraction)
+                else:
+                    snake.draw(snake_interpolation_fraction)
+                profiler.mark("snake")
+
+                if self.profiler_overlay_enabled:
+                    overlay_rect = self._draw_profiler_overlay()
+                    if dirty_rects_enabled:
+                        prev_board_rects.append(overlay_rect)
+                    profiler.skip()
+
+                self._draw_status_bar()
+                profiler.mark("status_bar")
+
+                pygame.display.update()
+                profiler.mark("display")
+
+            self._add_latencies("input_to_display", turns_awaiting_display)
+            drawn_score = self.score
+            profiler.end_frame()
+            frame_started = False
+
+    def _give_turns(self, snake, recording, tick, pending_turns, until, turns_awaiting_tick):
+        """Give the snake the pending turns pressed up to a time, in the order they were pressed.
 
-            self._draw_status_bar()
+        Args:
+            snake (Snake): The snake to steer.
+            recording (Recording): The recording of the game, which gets every turn at the current tick.
+            tick (int): The number of simulation ticks run so far.
+            pending_turns (deque): The (timestamp, orientation) of the turns not given to the snake yet, oldest
+                                   first. The turns that are given are removed from it.
+            until (float): The time.perf_counter() value up to which the turns are given.
+            turns_awaiting_tick (list): The timestamps of the turns given to the snake. The turns the snake
+                                        accepts are added to it.
+        """
+        while pending_turns and pending_turns[0][0] <= until:
+            timestamp, orientation = pending_turns.popleft()
+            recording.record(tick, orientation)
+            if snake.orient(orientation):
+                turns_awaiting_tick.append(timestamp)
+
+    def _steer_with_autopilot(self, autopilot, snake, state, recording, tick):
+        """Give the snake the direction chosen by the autopilot, timing the decision.
+
+        Args:
+            autopilot (Autopilot): The autopilot steering the snake.
+            snake (Snake): The snake to steer.
+            state (GameState): The state of the running game.
+            recording (Recording): The recording of the game, which gets the turn at the current tick.
+            tick (int): The number of simulation ticks run so far.
+        """
+        start_time = time.perf_counter_ns()
+        orientation = autopilot(state)
+        self.profiler.add_latency("decision", time.perf_counter_ns() - start_time)
+
+        if orientation is not None and snake.orient(orientation):
+            recording.record(tick, orientation)
 
-            pygame.display.update()
+    def _add_latencies(self, latency, timestamps, next_timestamps=None):
+        """Add the delays from turns being pressed until now to a latency of the profiler.
+
+        Args:
+            latency (str): One of profiler.LATENCIES.
+            timestamps (list): The time.perf_counter() values when the turns were pressed. Emptied afterwards.
+            next_timestamps (list or None): A list the timestamps are moved to, for the next latency.
+        """
+        if not timestamps:
+            return
+
+        now = time.perf_counter()
+        for timestamp in timestamps:
+            self.profiler.add_latency(latency, int((now - timestamp) * 1e9))
+
+        if next_timestamps is not None:
+            next_timestamps.extend(timestamps)
+        timestamps.clear()
+
+    def _save_recording(self, recording, state, num_ticks):
+        """Finish the recording of a game and save it to REPLAY_FILE, from a background thread.
+
+        Args:
+            recording (Recording): The recording of the game.
+            state (GameState): The last state of the game.
+            num_ticks (int): The number of ticks the game ran for.
+        """
+        recording.finish(state, num_ticks)
+        self._replay_writer.write(recording.to_bytes())
+
+    def _save_profile(self):
+        """Save the frame timings of the game to PROFILE_JSON_FILE and PROFILE_CSV_FILE, from background threads."""
+        self._profile_json_writer.write(self.profiler.to_json())
+        self._profile_csv_writer.write(self.profiler.to_csv())
+
+    def _draw_game_dirty_rects(self, snake, fruits, snake_interpolation_fraction, board_rect, prev_board_rects,
+                               score_changed):
+        """Redraw only the parts of the game scene that changed since the previous frame.
+
+        Restores the grass under everything drawn on the board in the previous frame, draws the fruits and the
+        snake again, and redraws the status bar only if the score changed. Only the affected regions are passed
+        to the display update. Drawing on the board is clipped so it never spills over the status bar. The profiler
+        overlay, if enabled, is drawn over the board like the snake.
+
+        Args:
+            snake (Snake): The snake to draw.
+            fruits (list): The fruits to draw.
+            snake_interpolation_fraction (float): The progress of the snake towards its next move.
+            board_rect (pygame.Rect): The region of the screen covered by the board.
+            prev_board_rects (list): The board regions drawn in the previous frame. Replaced in place with the
+                                     regions drawn in this frame.
+            score_changed (bool): Whether the status bar must be redrawn.
+        """
+        grass_surface = self._get_grass_surface()
+        for rect in prev_board_rects:
+            self.screen.blit(grass_surface, rect, rect)
+        self.profiler.mark("grass")
+
+        self.screen.set_clip(board_rect)
+        board_rects = [fruit.draw() for fruit in fruits]
+        self.profiler.mark("fruit")
+        board_rects += snake.draw(snake_interpolation_fraction, return_rects=True)
+        self.profiler.mark("snake")
+        if self.profiler_overlay_enabled:
+            board_rects.append(self._draw_profiler_overlay())
+            self.profiler.skip()
+        self.screen.set_clip(None)
+
+        dirty_rects = prev_board_rects + board_rects
+        if score_changed:
+            dirty_rects.append(self._draw_status_bar())
+            self.profiler.mark("status_bar")
+
+        pygame.display.update(dirty_rects)
+        self.profiler.mark("display")
+        prev_board_rects[:] = board_rects
 
     def _game_over_scene(self):
         """Display the game over screen with score and high score.
 
+        The screen is drawn once, then the scene sleeps until there is an event to handle.
+
         Returns:
             str: The next scene to transition to ("game_scene", "main_menu_scene").
         """
 
-        # Save the high score
-        game_config = frozenset([
-            self.settings["board_size"]["selected_option"],
-            self.settings["num_fruits"]["selected_option"],
-            self.settings["snake_speed"]["selected_option"],
-            self.settings["game_mode"]["selected_option"],
-        ])
-
-        if game_config in self.high_scores:
-            current_high_score = self.high_scores[game_config]
-            self.high_scores[game_config] = self.score if self.score > current_high_score else current_high_score
-        else:
-            self.high_scores[game_config] = self.score
-
-        self._save_data()
+        # Record the game and look up the high score. Games played by the autopilot do not count. The game is
+        # written in the background, so the high score is looked up without it, and is 0 until a game is recorded.
+        game_config = self._get_game_config()
+        high_score = self.score_history.high_score(game_config) or 0
+        if not self.autopilot_enabled:
+            self.score_history.record_game(game_config, self.score, won=self.game_won, **self.last_game)
+            high_score = max(high_score, self.score)
 
         # Display
         self.screen.fill(LIGHT_GRASS_COLOR)
         render_title(self.screen, "You Won" if self.game_won else "Game Over")
 
-        score_title_font = pygame.font.Font(FONT_FACE_MEDIUM, 15)
-        score_font = pygame.font.Font(FONT_FACE_SEMI_BOLD, 35)
-        btn_font = pygame.font.Font(FONT_FACE_BOLD, 25)
+        score_title_font = get_font(FONT_FACE_MEDIUM, 15)
+        score_font = get_font(FONT_FACE_SEMI_BOLD, 35)
+        btn_font = get_font(FONT_FACE_BOLD, 25)
 
         score_bg_rect_top_y = 85
         score_bg_rect_bottom_y = 205
@@ -505,7 +1024,7 @@ class Game:
 
         render_centered_text(self.screen, str(self.score), score_font, -65,
                              score_value_row_y - self.viewport_height / 2, WHITE)
-        render_centered_text(self.screen, str(self.high_scores[game_config]), score_font, 65,
+        render_centered_text(self.screen, str(high_score), score_font, 65,
                              score_value_row_y - self.viewport_height / 2, WHITE)
 
         restart_btn_y_offset = (-25 + score_bg_rect_bottom_y + (
@@ -519,9 +1038,11 @@ class Game:
         pygame.display.update()
 
         while True:
-            for event in pygame.event.get():
+            for event in wait_for_events():
                 if event.type == pygame.QUIT:
                     exit_game()
+                elif event.type == pygame.WINDOWEXPOSED:
+                    pygame.display.update()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
                         play_sound(self, CLICK_SOUND)
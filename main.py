@@ -1,6 +1,26 @@
-from game import Game
+import argparse
+import time
+
+from constants import FPS
 
 if __name__ == "__main__":
-    game = Game()
+    start_time = time.perf_counter()
+
+    parser = argparse.ArgumentParser(description="Play Snake.")
+    parser.add_argument("--seed", type=int, default=None, help="seed that makes the fruit placement reproducible")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help=f"most frames per second drawn during a game, 0 for no limit (default: {FPS})")
+    parser.add_argument("--vsync", action="store_true", help="synchronize drawing with the monitor's refresh rate")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long importing, initializing and showing the first frame took")
+    args = parser.parse_args()
+
+    # Imported here so that the command line is parsed before pygame is loaded
+    from game import Game
+
+    import_time = time.perf_counter() - start_time
+
+    game = Game(args.seed, args.fps, args.vsync, args.profile_startup)
+    if args.profile_startup:
+        game.startup_timings = {"imports": import_time, **game.startup_timings}
     game.run()
-    
\ No newline at end of file
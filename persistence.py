@@ -0,0 +1,104 @@
+import atexit
+import json
+import os
+import threading
+
+DATA_FILE = "game_data.json"
+
+# The settings that make up a game configuration, each with its own high score, in key order
+HIGH_SCORE_SETTINGS = ("board_size", "num_fruits", "snake_speed", "game_mode")
+
+
+def high_score_key(selected_options):
+    """Get the key of a game configuration in the saved high scores.
+
+    Args:
+        selected_options (dict): The selected option of at least every setting in HIGH_SCORE_SETTINGS, keyed by
+                                 setting.
+
+    Returns:
+        str: The options of the HIGH_SCORE_SETTINGS in order, separated by "/", e.g. "Medium/One/Moderate/Regular".
+    """
+    return "/".join(selected_options[setting] for setting in HIGH_SCORE_SETTINGS)
+
+
+class DataWriter:
+    """Saves data to a file from a background thread, so saving never waits on the disk.
+
+    Saves that arrive while a write is in progress are coalesced: only the latest contents are written next. Each write
+    goes to a temporary file that then replaces the file, so a crash never leaves a half-written file behind.
+    Pending data is written before the interpreter exits.
+
+    Attributes:
+        path (str): The path of the file to write.
+    """
+
+    def __init__(self, path):
+        """Initialize the writer and start its thread.
+
+        Args:
+            path (str): The path of the file to write.
+        """
+        self.path = path
+        self._pending = None  # The contents waiting to be written, or None
+        self._writing = False
+        self._condition = threading.Condition()
+
+        threading.Thread(target=self._run, name="data-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def save(self, data):
+        """Schedule JSON data to be written, replacing any contents that have not been written yet. Returns immediately.
+
+        Args:
+            data: The JSON-serializable data. It is serialized before returning, so it can be changed afterwards.
+        """
+        self.write(json.dumps(data))
+
+    def write(self, contents):
+        """Schedule contents to be written, replacing any contents that have not been written yet. Returns immediately.
+
+        Args:
+            contents (str or bytes): The contents of the file. Text is written with no newline translation.
+        """
+        with self._condition:
+            self._pending = contents
+            self._condition.notify_all()
+
+    def flush(self):
+        """Wait until all scheduled contents have been written."""
+        with self._condition:
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+
+    def _run(self):
+        """Write the latest scheduled contents whenever there are some, forever."""
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                contents = self._pending
+                self._pending = None
+                self._writing = True
+
+            try:
+                self._write(contents)
+            except OSError as e:
+                print(f"Could not save {self.path}: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, contents):
+        """Atomically replace the file's contents.
+
+        Args:
+            contents (str or bytes): The contents to write.
+        """
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") if isinstance(contents, bytes) else open(temp_path, "w", newline="") as f:
+            f.write(contents)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
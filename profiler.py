@@ -0,0 +1,155 @@
+import csv
+import io
+import json
+import time
+from array import array
+
+PROFILE_JSON_FILE = "last_game_profile.json"
+PROFILE_CSV_FILE = "last_game_profile.csv"
+
+# Parts of a game scene frame that are timed, in the order they run
+SECTIONS = ("input", "move", "fruit", "grass", "snake", "status_bar", "display")
+# Delays from a turn being pressed to the simulation tick that takes it, and to the first frame shown after that tick,
+# and the time the autopilot takes to choose each move
+LATENCIES = ("input_to_tick", "input_to_display", "decision")
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """Times the parts of each frame of the game scene, keeping the most recent timings.
+
+    A frame is split into sections by calling mark() after each part of it: the time since the previous mark (or
+    the start of the frame) is added to the section. This costs one perf_counter_ns() call per mark, so profiling
+    stays on in normal play. Every section keeps a rolling window of its last timings, over the frames it ran in,
+    and percentiles are only computed when they are asked for. The LATENCIES are kept the same way, one timing
+    per turn or autopilot move, with add_latency().
+
+    Attributes:
+        window (int): The number of frames kept.
+        num_frames (int): The number of frames profiled so far.
+    """
+
+    __slots__ = ("window", "num_frames", "_samples", "_num_samples", "_frames", "_frame", "_frame_start",
+                 "_last_mark", "_skipped")
+
+    def __init__(self, window=600):
+        """Initialize an empty profiler.
+
+        Args:
+            window (int): The number of frames to keep timings for.
+        """
+        self.window = window
+        self.num_frames = 0
+        self._samples = {section: array("q", [0]) * window for section in SECTIONS + ("frame",) + LATENCIES}
+        self._num_samples = dict.fromkeys(self._samples, 0)
+        self._frames = []  # The timings of each section in the last frames, oldest first
+        self._frame = dict.fromkeys(SECTIONS, 0)
+        self._frame_start = 0
+        self._last_mark = 0
+        self._skipped = 0  # Time left out of the current frame by skip()
+
+    def start_frame(self):
+        """Start timing a frame."""
+        self._frame_start = self._last_mark = time.perf_counter_ns()
+        self._skipped = 0
+
+    def mark(self, section):
+        """Add the time since the previous mark, or the start of the frame, to a section of the current frame.
+
+        Args:
+            section (str): One of SECTIONS.
+        """
+        now = time.perf_counter_ns()
+        self._frame[section] += now - self._last_mark
+        self._last_mark = now
+
+    def skip(self):
+        """Leave the time since the previous mark out of every section and out of the frame time.
+
+        Used for time the frame does not spend on its own work, e.g. waiting for input or drawing the overlay.
+        """
+        now = time.perf_counter_ns()
+        self._skipped += now - self._last_mark
+        self._last_mark = now
+
+    def end_frame(self):
+        """Finish timing the current frame and add its timings to the rolling windows."""
+        frame = self._frame
+        frame_time = time.perf_counter_ns() - self._frame_start - self._skipped
+        frame["frame"] = frame_time
+
+        for section, duration in frame.items():
+            if duration:
+                self._add_sample(section, duration)
+
+        self._frames.append(tuple(frame[section] for section in SECTIONS) + (frame_time,))
+        if len(self._frames) > 2 * self.window:
+            del self._frames[:-self.window]
+
+        self._frame = dict.fromkeys(SECTIONS, 0)
+        self.num_frames += 1
+
+    def add_latency(self, latency, duration):
+        """Add the timing of one turn or autopilot move to a latency.
+
+        Args:
+            latency (str): One of LATENCIES.
+            duration (int): The delay, in nanoseconds.
+        """
+        self._add_sample(latency, duration)
+
+    def _add_sample(self, section, duration):
+        """Add a timing to the rolling window of a section, replacing the oldest one if the window is full.
+
+        Args:
+            section (str): One of SECTIONS, "frame" or one of LATENCIES.
+            duration (int): The timing, in nanoseconds.
+        """
+        count = self._num_samples[section]
+        self._samples[section][count % self.window] = duration
+        self._num_samples[section] = count + 1
+
+    def percentiles(self, section):
+        """Get percentiles of a section's timings over the rolling window.
+
+        Args:
+            section (str): One of SECTIONS, "frame" for the whole frame, or one of LATENCIES.
+
+        Returns:
+            dict: The PERCENTILES, in microseconds, keyed by "p50", "p95" and "p99". Empty if the section never ran.
+        """
+        count = min(self._num_samples[section], self.window)
+        if count == 0:
+            return {}
+
+        samples = sorted(self._samples[section][:count])
+        return {f"p{p}": samples[min(count - 1, count * p // 100)] / 1000 for p in PERCENTILES}
+
+    def summary(self):
+        """Get the percentiles of every section.
+
+        Returns:
+            dict: The percentiles() of each section, the whole frame and each latency, keyed by section.
+        """
+        return {section: self.percentiles(section) for section in SECTIONS + ("frame",) + LATENCIES}
+
+    def to_json(self):
+        """Get the summary() as JSON.
+
+        Returns:
+            str: The number of frames timed, the window and the summary, in microseconds.
+        """
+        return json.dumps({"frames": self.num_frames, "window": self.window, "unit": "us", "sections": self.summary()},
+                          indent=4)
+
+    def to_csv(self):
+        """Get the timings of the last frames as CSV, one row per frame, in nanoseconds.
+
+        Returns:
+            str: A header row with the sections, then one row per frame.
+        """
+        f = io.StringIO()
+        writer = csv.writer(f)
+        writer.writerow(SECTIONS + ("frame",))
+        writer.writerows(self._frames[-self.window:])
+        return f.getvalue()
@@ -0,0 +1,179 @@
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from array import array
+
+from engine import ORIENTATIONS, new_game, orient, step
+
+REPLAY_FILE = "last_game.replay"
+
+
+def fingerprint(state):
+    """Summarize everything about a game state that a replay must reproduce.
+
+    Args:
+        state (GameState): The game state.
+
+    Returns:
+        str: A hash of the snake, its direction, the fruits, the score, the game over flags and the RNG state.
+    """
+    data = [list(state.body), state.current_orientation, list(state.next_orientations), state.was_moved,
+            state.fruits, state.score, state.game_over, state.game_won, state.rng.getstate()]
+    return hashlib.sha256(repr(data).encode()).hexdigest()[:16]
+
+
+class Recording:
+    """The settings, seed and player inputs of a game, enough to replay it exactly.
+
+    Inputs are stored packed into one 32-bit unsigned integer each: the tick they were given at, shifted left by
+    two bits, plus the index of the direction in ORIENTATIONS.
+
+    Attributes:
+        board_dimensions (tuple): Number of grid cells (columns, rows).
+        game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+        num_fruits (int): Number of fruits on the board.
+        seed (int): The seed of the game's random number generator.
+        inputs (array): The packed (tick, direction) inputs, in the order they were given.
+        num_ticks (int): The number of ticks the game ran for.
+        final_fingerprint (str or None): The fingerprint() of the game's last state.
+    """
+
+    def __init__(self, board_dimensions, game_mode, num_fruits, seed):
+        """Initialize an empty recording.
+
+        Args:
+            board_dimensions (tuple): Number of grid cells (columns, rows).
+            game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+            num_fruits (int): Number of fruits on the board.
+            seed (int): The seed of the game's random number generator.
+        """
+        self.board_dimensions = tuple(board_dimensions)
+        self.game_mode = game_mode
+        self.num_fruits = num_fruits
+        self.seed = seed
+        self.inputs = array("I")
+        self.num_ticks = 0
+        self.final_fingerprint = None
+
+    def new_game(self):
+        """Create the game this recording starts from.
+
+        Returns:
+            GameState: The new game, with its own random number generator seeded from the recording.
+        """
+        return new_game(self.board_dimensions, self.game_mode, self.num_fruits, random.Random(self.seed))
+
+    def record(self, tick, orientation):
+        """Record a direction change given by the player.
+
+        Args:
+            tick (int): The number of ticks the game had run when the input was given.
+            orientation (tuple): The direction (dx, dy) given.
+        """
+        self.inputs.append(tick << 2 | ORIENTATIONS.index(orientation))
+
+    def finish(self, state, num_ticks):
+        """Record how the game ended.
+
+        Args:
+            state (GameState): The last state of the game.
+            num_ticks (int): The number of ticks the game ran for.
+        """
+        self.num_ticks = num_ticks
+        self.final_fingerprint = fingerprint(state)
+
+    def to_bytes(self):
+        """Get the contents of the recording's file: a JSON header line followed by the packed inputs in little-endian
+        order.
+
+        Returns:
+            bytes: The file contents, to be read back by load().
+        """
+        header = {
+            "board_dimensions" : self.board_dimensions,
+            "game_mode"        : self.game_mode,
+            "num_fruits"       : self.num_fruits,
+            "seed"             : self.seed,
+            "num_ticks"        : self.num_ticks,
+            "final_fingerprint": self.final_fingerprint,
+        }
+
+        inputs = array("I", self.inputs)
+        if sys.byteorder == "big":
+            inputs.byteswap()
+
+        return json.dumps(header).encode() + b"\n" + inputs.tobytes()
+
+    @classmethod
+    def load(cls, path):
+        """Read a recording file, as written from to_bytes().
+
+        Args:
+            path (str): The path of the file to read.
+
+        Returns:
+            Recording: The recording.
+        """
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            packed_inputs = f.read()
+
+        recording = cls(header["board_dimensions"], header["game_mode"], header["num_fruits"], header["seed"])
+        recording.num_ticks = header["num_ticks"]
+        recording.final_fingerprint = header["final_fingerprint"]
+        recording.inputs.frombytes(packed_inputs)
+        if sys.byteorder == "big":
+            recording.inputs.byteswap()
+
+        return recording
+
+
+def replay(recording):
+    """Re-run a recorded game headless, as fast as possible.
+
+    Args:
+        recording (Recording): The recording to replay.
+
+    Returns:
+        GameState: The state the game ended in.
+    """
+    state = recording.new_game()
+    inputs = recording.inputs
+    next_input = 0
+
+    for tick in range(recording.num_ticks + 1):
+        while next_input < len(inputs) and inputs[next_input] >> 2 == tick:
+            orient(state, ORIENTATIONS[inputs[next_input] & 3])
+            next_input += 1
+
+        if tick < recording.num_ticks:
+            step(state)
+
+    return state
+
+
+def main():
+    """Replay a recorded game from the command line and check that it ends in the recorded state."""
+    parser = argparse.ArgumentParser(description="Replay a recorded Snake game.")
+    parser.add_argument("path", nargs="?", default=REPLAY_FILE, help=f"recording to replay (default: {REPLAY_FILE})")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.path)
+
+    start_time = time.perf_counter()
+    state = replay(recording)
+    elapsed_time = time.perf_counter() - start_time
+
+    matches = fingerprint(state) == recording.final_fingerprint
+    print(f"Replayed {recording.num_ticks} ticks in {elapsed_time * 1000:.2f} ms: score {state.score}, "
+          f"length {len(state.body)}, final state {'matches' if matches else 'DOES NOT MATCH'} the recording.")
+
+    if not matches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+import argparse
+import atexit
+import sqlite3
+import threading
+import time
+
+from persistence import HIGH_SCORE_SETTINGS
+
+SCORE_HISTORY_FILE = "score_history.db"
+
+# Schema migrations, applied in order. The database's user_version is the number of migrations applied.
+_MIGRATIONS = (
+    """
+    CREATE TABLE games (
+        id          INTEGER PRIMARY KEY,
+        finished_at REAL,
+        board_size  TEXT    NOT NULL,
+        num_fruits  TEXT    NOT NULL,
+        snake_speed TEXT    NOT NULL,
+        game_mode   TEXT    NOT NULL,
+        score       INTEGER NOT NULL,
+        duration    REAL,
+        length      INTEGER,
+        seed        INTEGER,
+        won         INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX games_by_config_and_score ON games (board_size, num_fruits, snake_speed, game_mode, score);
+    CREATE INDEX games_by_finished_at ON games (finished_at);
+    """,
+)
+
+_CONFIG_CONDITION = " AND ".join(f"{setting} = ?" for setting in HIGH_SCORE_SETTINGS)
+
+
+class ScoreHistory:
+    """A SQLite database of every finished game, with queries for the best scores of each game configuration.
+
+    A game configuration is a dict with the selected option of every setting in HIGH_SCORE_SETTINGS. Games are
+    indexed by configuration and score, so the high score, the top scores and the score percentiles of a
+    configuration are looked up without scanning the other games.
+
+    Games are recorded from a background thread with a connection of its own, so recording one never waits on the
+    disk. Queries only see the games written so far. Recorded games that have not been written yet are written
+    before the interpreter exits.
+
+    Attributes:
+        path (str): The path of the database file.
+    """
+
+    def __init__(self, path, legacy_high_scores=None):
+        """Open the database, creating it or updating its schema if needed.
+
+        Args:
+            path (str): The path of the database file.
+            legacy_high_scores (dict or None): High scores from game_data.json, keyed by
+                                               persistence.high_score_key(). They are imported as games when the
+                                               database is created.
+        """
+        self.path = path
+        self._connection = self._connect()
+        self._pending_games = []  # The rows of the games recorded but not written yet
+        self._writing = False
+        self._closed = False
+        self._writer = None  # The thread that writes the recorded games, started by the first record_game()
+        self._condition = threading.Condition()
+
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        with self._connection:
+            for migration in _MIGRATIONS[version:]:
+                for statement in migration.split(";"):
+                    if statement.strip():
+                        self._connection.execute(statement)
+            self._connection.execute(f"PRAGMA user_version = {len(_MIGRATIONS)}")
+
+            if version == 0 and legacy_high_scores:
+                self._import_high_scores(legacy_high_scores)
+
+    def _connect(self):
+        """Open a connection to the database.
+
+        Returns:
+            sqlite3.Connection: The connection, in WAL mode.
+        """
+        connection = sqlite3.connect(self.path)
+        # Commits in WAL mode only append to the log, without waiting for the disk to sync
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+
+    def _import_high_scores(self, high_scores):
+        """Add a game for each high score, with only its configuration and score known.
+
+        Args:
+            high_scores (dict): The high scores, keyed by persistence.high_score_key().
+        """
+        rows = [tuple(key.split("/")) + (score,) for key, score in high_scores.items()]
+        self._connection.executemany(
+            f"INSERT INTO games ({', '.join(HIGH_SCORE_SETTINGS)}, score) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def record_game(self, config, score, duration=None, length=None, seed=None, won=False):
+        """Add a finished game. Returns immediately, and the game is written in the background, see flush().
+
+        Args:
+            config (dict): The game configuration.
+            score (int): The number of fruits eaten.
+            duration (float or None): The game time, in seconds.
+            length (int or None): The final length of the snake.
+            seed (int or None): The seed of the game's random number generator.
+            won (bool): Whether the game ended by filling the board.
+        """
+        row = (time.time(),) + self._config_values(config) + (score, duration, length, seed, int(won))
+        with self._condition:
+            self._pending_games.append(row)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_games, name="score-history-writer", daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+            self._condition.notify_all()
+
+    def flush(self):
+        """Wait until every recorded game has been written."""
+        with self._condition:
+            while self._pending_games or self._writing:
+                self._condition.wait()
+
+    def _write_games(self):
+        """Write the recorded games whenever there are some, until the database is closed."""
+        connection = self._connect()
+        while True:
+            with self._condition:
+                while not self._pending_games and not self._closed:
+                    self._condition.wait()
+                if not self._pending_games:
+                    connection.close()
+                    return
+                rows = self._pending_games
+                self._pending_games = []
+                self._writing = True
+
+            try:
+                with connection:
+                    connection.executemany(
+                        f"INSERT INTO games (finished_at, {', '.join(HIGH_SCORE_SETTINGS)}, score, duration, length, "
+                        f"seed, won) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error as e:
+                print(f"Could not record the game in {self.path}: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def high_score(self, config):
+        """Get the best score of a game configuration.
+
+        Args:
+            config (dict): The game configuration.
+
+        Returns:
+            int or None: The high score, or None if no game was played with this configuration.
+        """
+        return self._connection.execute(f"SELECT MAX(score) FROM games WHERE {_CONFIG_CONDITION}",
+                                        self._config_values(config)).fetchone()[0]
+
+    def top_games(self, config, limit=10):
+        """Get the best games of a game configuration.
+
+        Args:
+            config (dict): The game configuration.
+            limit (int): The most games to return.
+
+        Returns:
+            list: A (score, length, duration, seed, finished_at) tuple for each game, best first.
+        """
+        return self._connection.execute(
+            f"SELECT score, length, duration, seed, finished_at FROM games WHERE {_CONFIG_CONDITION} "
+            f"ORDER BY score DESC LIMIT ?", self._config_values(config) + (limit,)).fetchall()
+
+    def score_at_percentile(self, config, percentile):
+        """Get the score that a percentage of the games of a game configuration did not beat.
+
+        Args:
+            config (dict): The game configuration.
+            percentile (float): The percentage, from 0 to 100.
+
+        Returns:
+            int or None: The score at the percentile, or None if no game was played with this configuration.
+        """
+        num_games = self.num_games(config)
+        if num_games == 0:
+            return None
+
+        offset = min(num_games - 1, int(num_games * percentile / 100))
+        return self._connection.execute(
+            f"SELECT score FROM games WHERE {_CONFIG_CONDITION} ORDER BY score LIMIT 1 OFFSET ?",
+            self._config_values(config) + (offset,)).fetchone()[0]
+
+    def percentile_of_score(self, config, score):
+        """Get the percentage of the games of a game configuration with a lower score.
+
+        Args:
+            config (dict): The game configuration.
+            score (int): The score to rank.
+
+        Returns:
+            float or None: The percentage, from 0 to 100, or None if no game was played with this configuration.
+        """
+        num_games = self.num_games(config)
+        if num_games == 0:
+            return None
+
+        num_lower = self._connection.execute(f"SELECT COUNT(*) FROM games WHERE {_CONFIG_CONDITION} AND score < ?",
+                                             self._config_values(config) + (score,)).fetchone()[0]
+        return num_lower / num_games * 100
+
+    def num_games(self, config):
+        """Count the games of a game configuration.
+
+        Args:
+            config (dict): The game configuration.
+
+        Returns:
+            int: The number of games played with this configuration.
+        """
+        return self._connection.execute(f"SELECT COUNT(*) FROM games WHERE {_CONFIG_CONDITION}",
+                                        self._config_values(config)).fetchone()[0]
+
+    def close(self):
+        """Write the recorded games and close the database."""
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._connection.close()
+
+    @staticmethod
+    def _config_values(config):
+        """Get the options of a game configuration in HIGH_SCORE_SETTINGS order, as query parameters.
+
+        Args:
+            config (dict): The game configuration.
+
+        Returns:
+            tuple: The selected option of each setting.
+        """
+        return tuple(config[setting] for setting in HIGH_SCORE_SETTINGS)
+
+
+def main():
+    """Print the leaderboard of a game configuration from the command line."""
+    parser = argparse.ArgumentParser(description="Show the best Snake games of a game configuration.")
+    parser.add_argument("--board-size", default="Medium",
+                        choices=["Small", "Medium", "Large", "Extra Large", "Huge", "Gigantic"])
+    parser.add_argument("--fruits", default="One", choices=["One", "Two", "Three"])
+    parser.add_argument("--speed", default="Moderate", choices=["Slow", "Moderate", "Fast", "Very Fast"])
+    parser.add_argument("--mode", default="Regular", choices=["Regular", "Infinite", "Peaceful"])
+    parser.add_argument("--top", type=int, default=10, help="number of games to show (default: 10)")
+    parser.add_argument("--database", default=SCORE_HISTORY_FILE,
+                        help=f"score history to read (default: {SCORE_HISTORY_FILE})")
+    args = parser.parse_args()
+
+    config = {"board_size": args.board_size, "num_fruits": args.fruits, "snake_speed": args.speed,
+              "game_mode": args.mode}
+    history = ScoreHistory(args.database)
+
+    num_games = history.num_games(config)
+    print(f"{num_games} games on {args.board_size} board, {args.fruits} fruit(s), {args.speed} speed, "
+          f"{args.mode} mode.")
+    if num_games == 0:
+        return
+
+    percentiles = ", ".join(f"p{p} {history.score_at_percentile(config, p)}" for p in (50, 90, 99))
+    print(f"Scores: {percentiles}")
+
+    for rank, (score, length, duration, seed, finished_at) in enumerate(history.top_games(config, args.top), 1):
+        date = time.strftime("%Y-%m-%d %H:%M", time.localtime(finished_at)) if finished_at is not None else "-"
+        length = "-" if length is None else length
+        duration = "-" if duration is None else f"{duration:.1f} s"
+        seed = "-" if seed is None else seed
+        print(f"{rank:>3}. {score:>5}  length {length:>5}  {duration:>9}  seed {seed}  {date}")
+
+
+if __name__ == "__main__":
+    main()
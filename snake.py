@@ -1,137 +1,121 @@
-from collections import deque
-
 import pygame
-from pygame import Vector2
 
 from constants import *
+from engine import orient
 from utils import play_sound
 
 
 class Snake:
-    """The snake object which is controlled by the player.
+    """Renders the snake of a game and forwards the player's input to it.
+
+    The snake's body and movement are part of the game state, see the engine module.
 
     Attributes:
         game: The Game instance this snake belongs to.
+        state (GameState): The state of the game the snake is in.
         color: The RGB color tuple for the snake's head.
-        current_orientation (Vector2): The current movement direction.
-        next_orientations (deque): A queue of upcoming direction changes.
-        body (deque): List of Vector2 grid positions for snake segments.
-        was_moved (bool): Whether the snake has made its initial move.
     """
 
-    def __init__(self, game, tile_x, tile_y, initial_size, initial_orientation, color):
-        """Initialize the snake at a grid position with a given size and direction.
+    __slots__ = ("game", "state", "color", "_gradient", "_gradient_color", "_sprites", "_sprites_key",
+                 "_static_body_layer", "_static_body_key")
+
+    def __init__(self, game, state, color):
+        """Initialize the snake renderer.
 
         Args:
             game: The Game instance.
-            tile_x (int): The starting x-coordinate on the game grid.
-            tile_y (int): The starting y-coordinate on the game grid.
-            initial_size (int): The initial length of the snake.
-            initial_orientation (Vector2): The initial movement direction.
+            state (GameState): The state of the game the snake is in.
             color: The RGB color tuple for the snake's head.
         """
         self.game = game
+        self.state = state
         self.color = color
-        self.current_orientation = initial_orientation
-        self.next_orientations = deque()
-        self.body = deque()
-        self.was_moved = False
-
-        # Generate the segments of the snake
-        for i in range(initial_size):
-            point = Vector2(tile_x, tile_y) + initial_orientation * i
-            self.body.append(point)
-
-    def _draw_cell(self, pos, color):
-        """Draw a single snake segment at the given position.
+        self._gradient = []
+        self._gradient_color = None
+        self._sprites = []
+        self._sprites_key = None
+        self._static_body_layer = None
+        self._static_body_key = None
+
+    @property
+    def was_moved(self):
+        """bool: Whether the snake has made its initial move."""
+        return self.state.was_moved
+
+    def _get_color_gradient(self, length):
+        """Get the colors of the snake's body gradient, from the head to the tail.
+
+        Creates a gradient effect by slightly darkening the color for each segment. Each darkening takes at least 1
+        off every channel that is not 0 yet, so the gradient reaches its darkest color within 256 segments, and the
+        segments after that all have the last color. The colors are cached and only extended when the snake has
+        grown, so a frame costs nothing here unless the snake got longer.
 
         Args:
-            pos (Vector2): The grid position to draw the cell.
-            color: The RGB color tuple for the cell.
-        """
-        x = pos.x * self.game.cell_size
-        y = pos.y * self.game.cell_size
-
-        cell_rect = pygame.Rect(x, y, self.game.cell_size, self.game.cell_size)
-
-        pygame.draw.rect(self.game.screen, color, cell_rect)
-
-    def _generate_color_gradient_list(self):
-        """Generate a list of colors for the snake's body gradient.
-
-        Creates a gradient effect by slightly darkening the color for each segment.
+            length (int): The number of snake segments.
 
         Returns:
-            list: A list of RGB color tuples for each snake segment.
+            list: The RGB colors of the first `length` segments, the first one for the head, up to the darkest
+                color, which is used for every segment after it.
         """
-        color = self.color
+        if self._gradient_color != self.color:
+            self._gradient = [self.color]
+            self._gradient_color = self.color
+
+        gradient = self._gradient
         factor = 0.999
-        color_list = []
 
-        for i in range(len(self.body)):
-            color_list.append(color)
-            color = pygame.Color(int(color[0] * factor), int(color[1] * factor), int(color[2] * factor))
+        while len(gradient) < length:
+            color = gradient[-1]
+            darker = pygame.Color(int(color[0] * factor), int(color[1] * factor), int(color[2] * factor))
+            if darker == color:
+                break
+            gradient.append(darker)
 
-        color_list.reverse()
+        return gradient
 
-        return color_list
+    def _get_cell_sprites(self, length):
+        """Get a cell-sized surface filled with each color of the body gradient, from the head to the tail.
 
-    def _determine_cell_type(self, i):
-        """Determine the type of a snake cell (head, body, corner, or tail).
+        The sprites are cached like the gradient, and rebuilt when the color or the cell size changes. There is one
+        per color, so a sprite is looked up with the index of the segment counted from the head, clamped to the last
+        sprite.
 
         Args:
-            i (int): The index of the cell in the body deque.
+            length (int): The number of snake segments.
 
         Returns:
-            str: The cell type ("head", "body", "corner", or "tail").
+            list: The surfaces of the first `length` segments, the first one for the head, up to the one of the
+                darkest color, which is used for every segment after it.
         """
-        if i == len(self.body) - 1:
-            return "head"
-        elif i == 0:
-            return "tail"
-        else:
-            prev_cell = self.body[i - 1]
-            next_cell = self.body[i + 1]
-
-            if prev_cell.x != next_cell.x and prev_cell.y != next_cell.y:
-                return "corner"
-            else:
-                return "body"
-
-    def _calc_cell_orientation(self, cell, cell_index):
-        """Calculate the orientation of a snake cell.
+        gradient = self._get_color_gradient(length)
+        cell_size = self.game.cell_size
 
-        Args:
-            cell (Vector2): The grid position of the cell.
-            cell_index (int): The index of the cell in the body deque.
+        if self._sprites_key != (self.color, cell_size):
+            self._sprites = []
+            self._sprites_key = (self.color, cell_size)
 
-        Returns:
-            Vector2: The orientation vector for the cell.
-        """
-        if cell_index == len(self.body) - 1:
-            return self.current_orientation
+        sprites = self._sprites
+        while len(sprites) < len(gradient):
+            sprite = pygame.Surface((cell_size, cell_size))
+            sprite.fill(gradient[len(sprites)])
+            sprites.append(sprite)
 
-        cell_orientation = self.body[cell_index + 1] - cell
-
-        if cell_orientation.x == 0 and cell_orientation.y == 0:
-            return cell_orientation
-        else:
-            return cell_orientation.normalize()
+        return sprites
 
     def _play_orientation_sound(self, orientation):
         """Play a sound effect based on the snake's movement direction.
 
         Args:
-            orientation (Vector2): The movement direction.
+            orientation (tuple): The movement direction (dx, dy).
         """
-        if orientation.x == 0 and orientation.y == 1:
-            play_sound(self.game, UP_SOUND, 0.4)
-        elif orientation.x == 0 and orientation.y == -1:
-            play_sound(self.game, DOWN_SOUND, 0.4)
-        elif orientation.x == 1 and orientation.y == 0:
-            play_sound(self.game, RIGHT_SOUND, 0.4)
-        elif orientation.x == -1 and orientation.y == 0:
-            play_sound(self.game, LEFT_SOUND, 0.4)
+        if orientation == (0, 1):
+            play_sound(self.game, UP_SOUND)
+        elif orientation == (0, -1):
+            play_sound(self.game, DOWN_SOUND)
+        elif orientation == (1, 0):
+            play_sound(self.game, RIGHT_SOUND)
+        elif orientation == (-1, 0):
+            play_sound(self.game, LEFT_SOUND)
 
     def orient(self, orientation):
         """Set the snake's movement direction.
@@ -140,114 +124,220 @@ class Snake:
         changes. Plays a sound for each valid direction change.
 
         Args:
-            orientation (Vector2): The desired movement direction.
+            orientation (tuple): The desired movement direction (dx, dy).
+
+        Returns:
+            list: The direction changes that were accepted, see engine.orient().
         """
-        if not self.was_moved:
-            if orientation == -self.current_orientation:
-                # Prevent the snake from going backwards
-                return
+        accepted = orient(self.state, orientation)
+        for accepted_orientation in accepted:
+            self._play_orientation_sound(accepted_orientation)
+        return accepted
 
-            self.current_orientation = orientation
-            self.was_moved = True
-            self._play_orientation_sound(orientation)
+    def _add_segment_blits(self, blit_sequence, body, i, sprite, interpolation_fraction):
+        """Add the blits that draw one snake segment, with smooth movement and wrapping effects.
 
-        # Prevent the snake from moving backwards or registering a forward move by checking the current orientation or the first queued orientation.
-        if len(self.next_orientations) == 0:
-            if orientation == self.current_orientation or orientation == -self.current_orientation:
-                return
-        if len(self.next_orientations) != 0:
-            if orientation == self.next_orientations[-1] or orientation == -self.next_orientations[-1]:
-                return
+        Args:
+            blit_sequence (list): The (sprite, position) pairs to add to.
+            body (list): The (y, x) grid positions of the snake segments, from the tail to the head.
+            i (int): The index of the segment in the body.
+            sprite: The surface filled with the segment's color.
+            interpolation_fraction (float): A value between 0 and 1 indicating the fraction of the step to draw.
+        """
+        width, height = self.state.board_dimensions
+        cell_size = self.game.cell_size
+        y, x = body[i]
+
+        # Determine the orientation for each segment:
+        # - For the head, use the current movement direction
+        # - For other segments, use the direction to the next segment
+        is_head = i == len(body) - 1
+        is_wrapping = False
+        if is_head:
+            dx, dy = self.state.current_orientation
+        else:
+            next_y, next_x = body[i + 1]
+            dx = (next_x > x) - (next_x < x)
+            dy = (next_y > y) - (next_y < y)
+
+            # Keep cell moving towards the border if wrapping is happening
+            if abs(x - next_x) > 1 or abs(y - next_y) > 1:
+                is_wrapping = True
+                dx, dy = -dx, -dy
+
+        # Move every cell a bit towards the next cell
+        render_x = x + interpolation_fraction * dx
+        render_y = y + interpolation_fraction * dy
+        blit_sequence.append((sprite, (int(render_x * cell_size), int(render_y * cell_size))))
+
+        # Make wrapping smooth
+        if self.state.game_mode == "Infinite" or self.state.game_mode == "Peaceful":
+            if is_wrapping:
+                blit_sequence.append((sprite, (next_x * cell_size, next_y * cell_size)))
+            elif is_head:
+                extra_x = abs(render_x - x)
+                extra_y = abs(render_y - y)
+
+                wrap_pos = None
+                if render_x < 0:
+                    wrap_pos = (width - extra_x, y)
+                elif render_x > width - 1:
+                    wrap_pos = (-1 + extra_x, y)
+                elif render_y < 0:
+                    wrap_pos = (x, height - extra_y)
+                elif render_y > height - 1:
+                    wrap_pos = (x, -1 + extra_y)
+
+                if wrap_pos is not None:
+                    blit_sequence.append((sprite, (int(wrap_pos[0] * cell_size), int(wrap_pos[1] * cell_size))))
+
+        # Fill in corners of the snake body with the current segment color to avoid gaps
+        if is_head or (i > 0 and body[i - 1][1] != next_x and body[i - 1][0] != next_y):
+            blit_sequence.append((sprite, (x * cell_size, y * cell_size)))
+
+    def draw(self, interpolation_fraction, return_rects=False):
+        """Draw the snake with smooth movement and wrapping effects.
 
-        self.next_orientations.append(orientation)
-        self._play_orientation_sound(orientation)
+        Uses interpolation for smooth movement and applies a color gradient.
+        Handles wrapping in Infinite and Peaceful modes.
 
-    def move(self):
-        """Move the snake one step in its current direction.
+        The position of every cell to paint is computed in one pass over the body, and the cells are then blitted
+        from pre-filled sprites in a single Surface.blits() call.
 
-        Checks for collisions with borders or the snake itself based on game mode.
-        Updates the snake's position and applies the next queued direction.
+        Args:
+            interpolation_fraction (float): A value between 0 and 1 indicating the fraction of the step to draw.
+            return_rects (bool): Whether to return the regions that were drawn on.
 
         Returns:
-            tuple (bool, str or None): the bool indicates whether the move is successful,
-                                       and the str indicates the collision type ("border" or "self") if applicable.
+            list or None: The pygame.Rect regions of the screen that were drawn on, if requested.
         """
-        new_head = self.body[-1] + self.current_orientation
-
-        # Handle collision with border
-        if self.game.game_mode == "Infinite" or self.game.game_mode == "Peaceful":
-            new_head.x = new_head.x % self.game.board_dimensions[0]
-            new_head.y = new_head.y % self.game.board_dimensions[1]
-        elif not (0 <= new_head.x < self.game.board_dimensions[0] and 0 <= new_head.y < self.game.board_dimensions[
-            1]):
-            return False, "border"
-
-        # Handle collision with self
-        if self.game.game_mode != "Peaceful":
-            if new_head in list(self.body)[1:]:
-                return False, "self"
-
-        # Update the snake's position by removing the tail and adding a new head in the current direction
-        self.body.popleft()
-        self.body.append(new_head)
-        if len(self.next_orientations) != 0:
-            self.current_orientation = self.next_orientations.popleft()
-
-        return True, None
-
-    def grow(self):
-        """Increase the snake's length by duplicating the tail segment."""
-        self.body.appendleft(self.body[0].copy())
-
-    def draw(self, interpolation_fraction):
-        """Draw the snake with smooth movement and wrapping effects.
+        width = self.state.board_dimensions[0]
+        body = [divmod(cell, width) for cell in self.state.body]  # (y, x) of each segment, from the tail
+        sprites = self._get_cell_sprites(len(body))
+        last_sprite = len(sprites) - 1
+        head_index = len(body) - 1
 
-        Uses interpolation for smooth movement and applies a color gradient.
-        Handles wrapping in Infinite and Peaceful modes.
+        blit_sequence = []
+        for i in range(len(body)):
+            self._add_segment_blits(blit_sequence, body, i, sprites[min(head_index - i, last_sprite)],
+                                    interpolation_fraction)
+
+        return self.game.screen.blits(blit_sequence, return_rects)
+
+    def _get_static_body_layer(self):
+        """Get a transparent board-sized layer with the segments between the tail and the head at their cells.
+
+        The layer is only redrawn when the snake has moved or grown since it was last drawn.
+
+        Returns:
+            pygame.Surface: The layer, with STATIC_BODY_LAYER_COLOR_KEY where there is no segment.
+        """
+        width, height = self.state.board_dimensions
+        cell_size = self.game.cell_size
+        key = (self.state.moves, len(self.state.body), self.color, cell_size)
+
+        if self._static_body_key != key:
+            if self._static_body_layer is None or self._static_body_layer.get_size() != (
+                    width * cell_size, height * cell_size):
+                self._static_body_layer = pygame.Surface((width * cell_size, height * cell_size))
+                self._static_body_layer.set_colorkey(STATIC_BODY_LAYER_COLOR_KEY)
+
+            body = self.state.body
+            sprites = self._get_cell_sprites(len(body))
+            last_sprite = len(sprites) - 1
+            head_index = len(body) - 1
+            blit_sequence = []
+            for i in range(1, head_index):
+                y, x = divmod(body[i], width)
+                blit_sequence.append((sprites[min(head_index - i, last_sprite)], (x * cell_size, y * cell_size)))
+
+            self._static_body_layer.fill(STATIC_BODY_LAYER_COLOR_KEY)
+            self._static_body_layer.blits(blit_sequence, False)
+            self._static_body_key = key
+
+        return self._static_body_layer
+
+    def draw_with_static_body(self, interpolation_fraction):
+        """Draw the snake, only interpolating its head and tail.
+
+        All segments between the tail and the head keep still at their cells, in a layer that is redrawn once per
+        move. The cells they cover are the same as when every segment slides towards the next one, so only the two
+        moving ends are drawn per frame, and the cost of a frame does not depend on the snake's length.
+
+        Args:
+            interpolation_fraction (float): A value between 0 and 1 indicating the fraction of the step to draw.
+        """
+        width = self.state.board_dimensions[0]
+        body = [divmod(self.state.body[0], width)]
+        if len(self.state.body) > 1:
+            body.append(divmod(self.state.body[1], width))
+        sprites = self._get_cell_sprites(len(self.state.body))
+        head_index = len(self.state.body) - 1
+
+        # The tail goes under the rest of the body, as it does when every segment is drawn
+        tail_blits = []
+        if head_index > 0:
+            tail_sprite = sprites[min(head_index, len(sprites) - 1)]
+            self._add_segment_blits(tail_blits, body, 0, tail_sprite, interpolation_fraction)
+            self.game.screen.blits(tail_blits, False)
+
+        self.game.screen.blit(self._get_static_body_layer(), (0, 0))
+
+        head_blits = []
+        head_body = [divmod(self.state.body[head_index - 1], width)] if head_index > 0 else []
+        head_body.append(divmod(self.state.body[head_index], width))
+        self._add_segment_blits(head_blits, head_body, len(head_body) - 1, sprites[0], interpolation_fraction)
+        self.game.screen.blits(head_blits, False)
+
+    def draw_visible(self, interpolation_fraction, camera):
+        """Draw the part of the snake that is in view, on a board larger than the screen.
+
+        Only the cells in view and the ring of cells around them are looked at. The snake segments on them are found
+        from the board's occupancy, and their place in the body from the move their cell was last entered at, so the
+        cost of a frame depends on the size of the screen, not on the size of the board or the length of the snake.
+        Where segments overlap in Peaceful mode, only the one nearest to the head is drawn.
 
         Args:
             interpolation_fraction (float): A value between 0 and 1 indicating the fraction of the step to draw.
+            camera (Camera): The camera the board is seen through.
         """
-        color_list = self._generate_color_gradient_list()
-
-        # Draw each snake segment
-        for i, cell in enumerate(self.body):
-            color = color_list[i]
-
-            # Determine the orientation for each segment:
-            # - For the head, use the current movement direction
-            # - For other segments, use the direction to the next segment
-
-            cell_type = self._determine_cell_type(i)
-
-            cell_orientation = self._calc_cell_orientation(cell, i)
-            if cell_type != "head" and (abs(cell.x - self.body[i + 1].x) > 1 or abs(
-                    cell.y - self.body[i + 1].y) > 1):  # Keep cell moving towards the border if wrapping is happening
-                cell_orientation = -cell_orientation
-
-            # Move every cell a bit towards the next cell
-            render_pos = cell + interpolation_fraction * cell_orientation
-            self._draw_cell(render_pos, color)
-
-            # Make wrapping smooth
-            if self.game.game_mode == "Infinite" or self.game.game_mode == "Peaceful":
-                if cell_type != "head" and (abs(cell.x - self.body[i + 1].x) > 1 or abs(
-                        cell.y - self.body[
-                            i + 1].y) > 1):  # keep cell moving towards border if wrapping is happening
-                    self._draw_cell(Vector2(self.body[i + 1].x, self.body[i + 1].y), color)
-                elif cell_type == "head":
-                    extra_x = abs(render_pos.x - cell.x)
-                    extra_y = abs(render_pos.y - cell.y)
-
-                    if render_pos.x < 0:
-                        self._draw_cell(Vector2(self.game.board_dimensions[0] - extra_x, cell.y), color)
-                    elif render_pos.x > self.game.board_dimensions[0] - 1:
-                        self._draw_cell(Vector2(-1 + extra_x, cell.y), color)
-                    elif render_pos.y < 0:
-                        self._draw_cell(Vector2(cell.x, self.game.board_dimensions[1] - extra_y), color)
-                    elif render_pos.y > self.game.board_dimensions[1] - 1:
-                        self._draw_cell(Vector2(cell.x, -1 + extra_y), color)
-
-            # Fill in corners of the snake body with the current segment color to avoid gaps
-            if cell_type == "corner" or cell_type == "head":
-                self._draw_cell(cell, color)
+        state = self.state
+        width = state.board_dimensions[0]
+        body = state.body
+        occupancy = state.occupancy
+        entered_at = state.entered_at
+        head_index = len(body) - 1
+        moves = state.moves
+        columns, rows = camera.visible_cells()
+
+        indices = []
+        for row in rows:
+            row_start = row * width
+            for column in columns:
+                cell = row_start + column
+                if occupancy[cell]:
+                    i = head_index - (moves - entered_at[cell])
+                    indices.append(i)
+
+                    # The duplicates of the tail left by grow() are on the same cell, just before it in the body
+                    while i > 0 and body[i - 1] == cell:
+                        i -= 1
+                        indices.append(i)
+
+        # Draw from the tail to the head, as when every segment is drawn
+        indices.sort()
+        sprites = self._get_cell_sprites(len(body))
+        last_sprite = len(sprites) - 1
+
+        blit_sequence = []
+        for i in indices:
+            # The segment and its neighbors in the body, which decide how it is drawn
+            segments = [divmod(body[i - 1], width)] if i > 0 else []
+            segments.append(divmod(body[i], width))
+            if i < head_index:
+                segments.append(divmod(body[i + 1], width))
+
+            self._add_segment_blits(blit_sequence, segments, 1 if i > 0 else 0,
+                                    sprites[min(head_index - i, last_sprite)], interpolation_fraction)
+
+        self.game.screen.blits([(sprite, camera.to_screen(*position)) for sprite, position in blit_sequence], False)
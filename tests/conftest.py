@@ -0,0 +1,16 @@
+import pytest
+
+from benchmarks.common import use_dummy_drivers
+
+use_dummy_drivers()
+
+
+@pytest.fixture
+def game(tmp_path, monkeypatch):
+    """A game created with the dummy video and audio drivers, saving its files in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+
+    from game import Game
+    game = Game(seed=0)
+    yield game
+    game.score_history.close()
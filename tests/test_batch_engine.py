@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from batch_engine import ACTIONS, NO_ACTION, BatchGame
+from constants import CELL_SIZES, SCROLLING_BOARD_DIMENSIONS
+from engine import board_dimensions_for, new_game, step
+
+# A batch keeps every cell of every board in memory, too much for 64 boards larger than the screen
+BOARD_SIZES = [board_size for board_size in CELL_SIZES if board_size not in SCROLLING_BOARD_DIMENSIONS]
+NUM_GAMES = 64
+NUM_TICKS = 300
+
+
+def _set_fruits(state, cells):
+    """Replace the fruits of a scalar game, keeping its free-cell index consistent.
+
+    Args:
+        state (GameState): The game to update.
+        cells (list): The cell indices of the new fruits.
+    """
+    for cell in state.fruits:
+        state.free_cells.release(cell)
+    state.fruits = list(cells)
+    for cell in cells:
+        state.free_cells.take(cell)
+
+
+@pytest.mark.parametrize("num_fruits", [1, 2, 3])
+@pytest.mark.parametrize("game_mode", ["Regular", "Infinite", "Peaceful"])
+@pytest.mark.parametrize("board_size", BOARD_SIZES)
+def test_parity_with_scalar_engine(board_size, game_mode, num_fruits):
+    """Run a batch and the same games in the scalar engine side by side, checking that they never diverge.
+
+    Both get the same random actions. Fruit placement is random in each engine, so after every tick the scalar
+    games are given the fruits the batch placed.
+    """
+    board_dimensions = board_dimensions_for(board_size)
+    batch = BatchGame(NUM_GAMES, board_dimensions, game_mode, num_fruits, seed=0)
+    states = [new_game(board_dimensions, game_mode, num_fruits) for _ in range(NUM_GAMES)]
+    for i, state in enumerate(states):
+        _set_fruits(state, [cell for cell in batch.fruits[i].tolist() if cell >= 0])
+
+    rng = random.Random(0)
+    for tick in range(NUM_TICKS):
+        actions = [rng.randrange(NO_ACTION, len(ACTIONS)) for _ in range(NUM_GAMES)]
+        batch_events = batch.step(actions)
+        free_cell_counts = batch.free_cell_counts()
+
+        for i, state in enumerate(states):
+            action = ACTIONS[actions[i]] if actions[i] != NO_ACTION else None
+            _, events = step(state, action)
+            _set_fruits(state, [cell for cell in batch.fruits[i].tolist() if cell >= 0])
+
+            where = f"game {i}, tick {tick}"
+            assert sorted(events) == sorted(event for event, games in batch_events.items() if games[i]), where
+            assert list(state.body) == batch.body_cells(i), where
+            assert state.score == batch.score[i], where
+            assert state.game_over == batch.game_over[i] and state.game_won == batch.game_won[i], where
+            assert len(state.free_cells) == free_cell_counts[i], where
+            if not state.game_over:
+                assert ACTIONS[batch.direction[i]] == state.current_orientation, where
@@ -0,0 +1,49 @@
+import pygame
+
+import game as game_module
+
+
+def _run_game_over_scene(game, monkeypatch):
+    """Show the game over screen and press Enter on it.
+
+    Returns:
+        tuple: The scene the game over screen went to, and the texts it drew centered on the screen.
+    """
+    texts = []
+    render_centered_text = game_module.render_centered_text
+
+    def record_text(screen, text, *args):
+        texts.append(text)
+        return render_centered_text(screen, text, *args)
+
+    monkeypatch.setattr(game_module, "render_centered_text", record_text)
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+    return game._game_over_scene(), texts
+
+
+def test_autopilot_game_over_with_empty_history(game, monkeypatch):
+    """An autopilot game is not recorded, and with no recorded games the high score shows as 0."""
+    game.settings["player"]["selected_option"] = "Autopilot"
+    game._update_game_settings()
+    game.score = 42
+
+    next_scene, texts = _run_game_over_scene(game, monkeypatch)
+
+    assert next_scene == "game_scene"
+    assert texts[texts.index("High Score") + 2] == "0"
+    assert "None" not in texts
+    game.score_history.flush()
+    assert game.score_history.num_games(game._get_game_config()) == 0
+
+
+def test_game_over_high_score_includes_new_game(game, monkeypatch):
+    """A player's game counts towards the high score shown, before it has been written to the history."""
+    game.score = 42
+    game.last_game = {"duration": 12.5, "length": 45, "seed": 3}
+
+    next_scene, texts = _run_game_over_scene(game, monkeypatch)
+
+    assert next_scene == "game_scene"
+    assert texts[texts.index("High Score") + 2] == "42"
+    game.score_history.flush()
+    assert game.score_history.high_score(game._get_game_config()) == 42
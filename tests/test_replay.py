@@ -0,0 +1,23 @@
+from engine import DOWN, LEFT, UP, orient, step
+from persistence import DataWriter
+from replay import Recording, fingerprint, replay
+
+
+def test_saved_recording_replays_to_same_state(tmp_path):
+    """A recording written in the background by a DataWriter loads back and replays to the state it ended in."""
+    recording = Recording((20, 15), "Infinite", 2, seed=7)
+    state = recording.new_game()
+    turns = {3: UP, 10: LEFT, 18: DOWN}
+    for tick in range(40):
+        if tick in turns and orient(state, turns[tick]):
+            recording.record(tick, turns[tick])
+        step(state)
+    recording.finish(state, 40)
+
+    writer = DataWriter(str(tmp_path / "last_game.replay"))
+    writer.write(recording.to_bytes())
+    writer.flush()
+
+    loaded = Recording.load(writer.path)
+    assert list(loaded.inputs) == list(recording.inputs)
+    assert fingerprint(replay(loaded)) == recording.final_fingerprint == fingerprint(state)
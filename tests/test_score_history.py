@@ -0,0 +1,23 @@
+from score_history import ScoreHistory
+
+CONFIG = {"board_size": "Medium", "num_fruits": "One", "snake_speed": "Moderate", "game_mode": "Regular"}
+
+
+def test_recorded_games_are_written_in_background(tmp_path):
+    """Recorded games show up in queries once flushed, and are all written when the database is closed."""
+    path = str(tmp_path / "score_history.db")
+    history = ScoreHistory(path)
+    assert history.high_score(CONFIG) is None
+
+    history.record_game(CONFIG, 12, duration=30.0, length=15, seed=1)
+    history.flush()
+    assert history.high_score(CONFIG) == 12
+
+    for score in range(20):
+        history.record_game(CONFIG, score)
+    history.close()
+
+    history = ScoreHistory(path)
+    assert history.num_games(CONFIG) == 21
+    assert history.high_score(CONFIG) == 19
+    history.close()
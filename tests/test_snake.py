@@ -0,0 +1,14 @@
+from benchmarks.common import make_state
+from constants import SNAKE_COLOR_WHITE
+from snake import Snake
+
+
+def test_cell_sprites_stop_at_darkest_color(game):
+    """A long snake keeps one sprite per color of its gradient, not one per segment."""
+    state = make_state("Gigantic", 100000)
+    snake = Snake(game, state, SNAKE_COLOR_WHITE)
+
+    sprites = snake._get_cell_sprites(len(state.body))
+    assert len(sprites) <= 256
+    assert tuple(sprites[-1].get_at((0, 0)))[:3] == (0, 0, 0)
+    assert len(snake._get_cell_sprites(len(state.body) + 1)) == len(sprites)
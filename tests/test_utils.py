@@ -0,0 +1,16 @@
+import utils
+
+
+def test_failed_sound_loading_leaves_sounds_off(game, monkeypatch):
+    """A sound that fails to load part way through the bank keeps every sound from playing, instead of raising."""
+    def load_sounds():
+        raise FileNotFoundError("sounds/munching.wav")
+
+    utils.wait_for_assets()
+    monkeypatch.setattr(utils, "_sounds_loaded", False)
+    monkeypatch.setattr(utils, "load_sounds", load_sounds)
+
+    utils._load_sounds_in_background()
+
+    assert not utils.assets_loaded()
+    utils.play_sound(game, utils.MUNCHING_SOUND)
@@ -0,0 +1,205 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from constants import CELL_SIZES
+from controllers import CONTROLLERS
+from engine import EVENT_COLLIDED_BORDER, EVENT_COLLIDED_SELF, EVENT_WON, board_dimensions_for, new_game, step
+from profiler import PERCENTILES
+
+
+def load_controller(name):
+    """Look up a controller by name.
+
+    Args:
+        name (str): The name of a built-in controller, or "module:function" for any other policy function.
+
+    Returns:
+        callable: The controller, taking a GameState and returning a direction or None.
+    """
+    if name in CONTROLLERS:
+        return CONTROLLERS[name]
+
+    module_name, _, function_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def play_game(controller_name, board_size, game_mode, num_fruits, seed, max_ticks):
+    """Play a single headless game with a controller.
+
+    Args:
+        controller_name (str): The controller to play with, see load_controller().
+        board_size (str): The board size option ("Small", "Medium", "Large", "Extra Large", "Huge", "Gigantic").
+        game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+        num_fruits (int): Number of fruits on the board.
+        seed (int): Seed for the fruit placement and any randomness in the controller.
+        max_ticks (int): The number of ticks after which the game is stopped.
+
+    Returns:
+        dict: The result of the game, with the PERCENTILES and the maximum of the time the controller took to
+              choose each move, in microseconds, as "decision_us".
+    """
+    controller = load_controller(controller_name)
+    state = new_game(board_dimensions_for(board_size), game_mode, num_fruits, random.Random(seed))
+
+    end = "max_ticks"
+    ticks = 0
+    decision_times = []
+    while ticks < max_ticks:
+        start_time = time.perf_counter_ns()
+        action = controller(state)
+        decision_times.append(time.perf_counter_ns() - start_time)
+
+        state, events = step(state, action)
+        ticks += 1
+
+        if state.game_over:
+            for event in (EVENT_WON, EVENT_COLLIDED_BORDER, EVENT_COLLIDED_SELF):
+                if event in events:
+                    end = event
+            break
+
+    return {
+        "seed"       : seed,
+        "controller" : controller_name,
+        "board_size" : board_size,
+        "game_mode"  : game_mode,
+        "num_fruits" : num_fruits,
+        "score"      : state.score,
+        "length"     : len(state.body),
+        "ticks"      : ticks,
+        "won"        : state.game_won,
+        "end"        : end,
+        "decision_us": _decision_percentiles(decision_times),
+    }
+
+
+def _decision_percentiles(decision_times):
+    """Compute the percentiles of the times a controller took to choose its moves.
+
+    Args:
+        decision_times (list): The time of each decision, in nanoseconds.
+
+    Returns:
+        dict: The PERCENTILES and the maximum, in microseconds, keyed by "p50", "p95", "p99" and "max".
+    """
+    count = len(decision_times)
+    decision_times.sort()
+    percentiles = {f"p{p}": decision_times[min(count - 1, count * p // 100)] / 1000 for p in PERCENTILES}
+    percentiles["max"] = decision_times[-1] / 1000
+    return percentiles
+
+
+def _play_game(args):
+    """Unpack the arguments of play_game() for ProcessPoolExecutor.map()."""
+    return play_game(*args)
+
+
+def _summarize(values):
+    """Compute summary statistics of a list of numbers.
+
+    Args:
+        values (list): The numbers to summarize.
+
+    Returns:
+        dict: The mean, median, standard deviation, minimum and maximum.
+    """
+    return {
+        "mean"  : statistics.fmean(values),
+        "median": statistics.median(values),
+        "stdev" : statistics.pstdev(values),
+        "min"   : min(values),
+        "max"   : max(values),
+    }
+
+
+def run_tournament(controller_name, num_games, board_size, game_mode, num_fruits, seed=0, max_ticks=10000,
+                   workers=None, on_result=None):
+    """Play many headless games across worker processes.
+
+    Game i is played with seed `seed + i`, so results do not depend on the number of workers.
+
+    Args:
+        controller_name (str): The controller to play with, see load_controller().
+        num_games (int): The number of games to play, at least 1.
+        board_size (str): The board size option ("Small", "Medium", "Large", "Extra Large", "Huge", "Gigantic").
+        game_mode (str): The game mode ("Regular", "Infinite", "Peaceful").
+        num_fruits (int): Number of fruits on the board.
+        seed (int): The seed of the first game.
+        max_ticks (int): The number of ticks after which a game is stopped.
+        workers (int or None): The number of worker processes. Defaults to the number of CPUs.
+        on_result (callable or None): Called with each game result, in game order, as soon as it is available.
+
+    Returns:
+        dict: Aggregate statistics of the scores, the snake lengths, and the 99th percentile and the maximum of the
+              decision times of each game.
+    """
+    games = [(controller_name, board_size, game_mode, num_fruits, seed + i, max_ticks) for i in range(num_games)]
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, num_games // (workers * 8))
+
+    scores = []
+    lengths = []
+    decision_p99s = []
+    decision_maxes = []
+    wins = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(_play_game, games, chunksize=chunk_size):
+            scores.append(result["score"])
+            lengths.append(result["length"])
+            decision_p99s.append(result["decision_us"]["p99"])
+            decision_maxes.append(result["decision_us"]["max"])
+            wins += result["won"]
+            if on_result is not None:
+                on_result(result)
+
+    return {
+        "games"          : num_games,
+        "wins"           : wins,
+        "score"          : _summarize(scores),
+        "length"         : _summarize(lengths),
+        "decision_p99_us": _summarize(decision_p99s),
+        "decision_max_us": _summarize(decision_maxes),
+    }
+
+
+def main():
+    """Run a tournament from the command line.
+
+    Per-game results are written to stdout (or --output) as JSON lines, and the summary to stderr.
+    """
+    parser = argparse.ArgumentParser(description="Play headless Snake games with a controller.")
+    parser.add_argument("--controller", default="greedy",
+                        help=f"built-in controller ({', '.join(CONTROLLERS)}) or module:function")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--board-size", choices=list(CELL_SIZES), default="Medium")
+    parser.add_argument("--mode", choices=["Regular", "Infinite", "Peaceful"], default="Regular")
+    parser.add_argument("--fruits", type=int, choices=[1, 2, 3], default=1)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--max-ticks", type=int, default=10000, help="ticks after which a game is stopped")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--output", help="file to write the per-game JSON lines to (default: stdout)")
+    args = parser.parse_args()
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        summary = run_tournament(args.controller, args.games, args.board_size, args.mode, args.fruits, args.seed,
+                                 args.max_ticks, args.workers,
+                                 on_result=lambda result: print(json.dumps(result), file=output, flush=True))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
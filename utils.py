@@ -1,7 +1,55 @@
+import math
 import sys
+import threading
+import time
+from functools import lru_cache
+
 import pygame
+from asset_pack import load_asset_pack, open_resource
 from constants import *
 
+_fonts = {}  # Loaded fonts, keyed by (font face path, size)
+_sounds = {}  # Decoded sounds with their volume applied, keyed by (sound file path, volume)
+_sound_channels = {}  # Mixer channels reserved for each sound file path
+_next_sound_channel = {}  # Index of the reserved channel each sound file path plays on next
+_asset_loader = None  # The thread started by start_loading_assets()
+_sounds_loaded = False  # Whether the asset loader decoded every sound
+asset_load_timings = {}  # Seconds spent on each step of loading the assets in the background
+
+
+def get_font(face, size):
+    """Get a font from the shared font registry, loading it on first use.
+
+    Args:
+        face (str): The path to the font file.
+        size (int): The font size in pixels.
+
+    Returns:
+        pygame.font.Font: The font object, shared by every caller asking for the same face and size.
+    """
+    font = _fonts.get((face, size))
+    if font is None:
+        font = pygame.font.Font(open_resource(face), size)
+        _fonts[(face, size)] = font
+    return font
+
+
+@lru_cache(maxsize=256)
+def render_text(text, font, color):
+    """Render text to a surface, reusing the surface if the same text was rendered before.
+
+    The returned surface is shared between callers and must not be drawn on.
+
+    Args:
+        text (str): The text to render.
+        font: The Pygame font object, preferably obtained from get_font().
+        color: The RGB color tuple for the text.
+
+    Returns:
+        pygame.Surface: The rendered text.
+    """
+    return font.render(text, False, color)
+
 
 def center(obj, parent_obj):
     """Center an object within a parent object.
@@ -11,7 +59,8 @@ def center(obj, parent_obj):
         parent_obj: The parent object within which to center.
 
     Returns:
-        tuple: The coordinates (x, y) of what the top-left corner of the object should be to center it within the parent.
+        tuple: The coordinates (x, y) of what the top-left corner of the object should be to center it within the
+               parent.
     """
     parent_obj_center_x = parent_obj.width / 2
     parent_obj_center_y = parent_obj.height / 2
@@ -30,7 +79,8 @@ def center_x(obj, x):
         x (float): The x-coordinate to center around.
 
     Returns:
-        float: The x-coordinate of what the top-left corner of the object should be for the object to be centered horizontally.
+        float: The x-coordinate of what the top-left corner of the object should be for the object to be centered
+               horizontally.
     """
     obj = obj.get_rect()
     return x - obj.width / 2
@@ -44,7 +94,8 @@ def center_y(obj, y):
         y (float): The y-coordinate to center around.
 
     Returns:
-        float: The y-coordinate of what the top-left corner of the object should be for the object to be centered vertically.
+        float: The y-coordinate of what the top-left corner of the object should be for the object to be centered
+               vertically.
     """
     obj = obj.get_rect()
     return y - obj.height / 2
@@ -57,8 +108,8 @@ def render_title(screen, text):
         screen: The Pygame surface to render on.
         text (str): The title text to render.
     """
-    title_font = pygame.font.Font(FONT_FACE_SEMI_BOLD, 35)
-    menu_title = title_font.render(text, False, BLACK)
+    title_font = get_font(FONT_FACE_SEMI_BOLD, 35)
+    menu_title = render_text(text, title_font, BLACK)
     menu_title_x = center(menu_title.get_rect(), screen.get_rect())[0]
     screen.blit(menu_title, (menu_title_x, 20))
 
@@ -77,7 +128,7 @@ def render_centered_text(screen, text, font, px_away_from_center_x, px_away_from
     Returns:
         pygame.Rect: The rectangle of the rendered text for collision detection.
     """
-    btn_surface = font.render(text, False, color)
+    btn_surface = render_text(text, font, color)
 
     x, y = center(btn_surface.get_rect(), screen.get_rect())
     x += px_away_from_center_x
@@ -104,7 +155,7 @@ def render_select_btn(screen, x, y, width, selected_option, selected_option_font
     Returns:
         pygame.Rect: The rectangle of the dropdown button for collision detection.
     """
-    selected_text = selected_option_font.render(selected_option, False, WHITE)
+    selected_text = render_text(selected_option, selected_option_font, WHITE)
     height = selected_text.get_height()
     select_rect = pygame.Rect(x, y, width, height)
 
@@ -129,27 +180,186 @@ def render_select_btn(screen, x, y, width, selected_option, selected_option_font
 
     # Render label
     if label and label_font:
-        label_text = label_font.render(label, False, BLACK)
+        label_text = render_text(label, label_font, BLACK)
         label_y = y - label_text.get_height()
         screen.blit(label_text, (x, label_y))
 
     return select_rect
 
 
-def play_sound(game, sound_file_path, volume=1.0):
+def get_sound(sound_file_path, volume=1.0):
+    """Get a decoded sound from the sound bank, loading it on first use.
+
+    Args:
+        sound_file_path (str): The path to the sound file.
+        volume (float): The volume level (0.0 to 1.0) applied to the sound.
+
+    Returns:
+        pygame.mixer.Sound: The sound object, ready to play.
+    """
+    sound = _sounds.get((sound_file_path, volume))
+    if sound is None:
+        with open_resource(sound_file_path) as f:
+            sound = pygame.mixer.Sound(f)
+        sound.set_volume(volume)
+        _sounds[(sound_file_path, volume)] = sound
+    return sound
+
+
+def reserve_sound_channels():
+    """Reserve CHANNELS_PER_SOUND mixer channels for each sound effect in SOUNDS.
+
+    Must be called after the mixer is initialized. Each sound file gets its own channels, so overlapping effects
+    never wait for or steal a channel from each other, and a repeat of an effect overlaps the plays still going on.
+    """
+    num_channels = len(SOUNDS) * CHANNELS_PER_SOUND
+    pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), num_channels))
+    pygame.mixer.set_reserved(num_channels)
+
+    for i, sound_file_path in enumerate(SOUNDS):
+        first_channel = i * CHANNELS_PER_SOUND
+        _sound_channels[sound_file_path] = [pygame.mixer.Channel(first_channel + j) for j in range(CHANNELS_PER_SOUND)]
+        _next_sound_channel[sound_file_path] = 0
+
+
+def load_sounds():
+    """Decode every sound effect in SOUNDS, so playing one never waits on the disk.
+
+    Must be called after the mixer is initialized.
+    """
+    for sound_file_path, volume in SOUNDS.items():
+        get_sound(sound_file_path, volume)
+
+
+def _load_sounds_in_background():
+    """Decode the sounds, recording how long it takes. Runs in the asset loader thread.
+
+    Sounds are only played once every one of them has been decoded, so a failure part way leaves sound off.
+    """
+    global _sounds_loaded
+    start_time = time.perf_counter()
+    try:
+        load_sounds()
+    except Exception as e:  # A missing or broken file fails with an OSError or a pygame.error, among others
+        print(f"Sound is not available: {e}")
+        return
+
+    asset_load_timings["sounds"] = time.perf_counter() - start_time
+    _sounds_loaded = True
+
+
+def start_loading_assets():
+    """Map the asset pack into memory and open the mixer, then start loading the sounds in a background thread.
+
+    The mixer is opened on the calling thread, as SDL does not promise that its audio subsystem can be started from
+    any other. The first frame can be shown while the sounds load: fonts are loaded on first use, straight from the
+    mapped pack, and play_sound() skips the sounds played before they are ready.
+    """
+    global _asset_loader
+    if _asset_loader is None:
+        load_asset_pack()
+
+        try:
+            pygame.mixer.init()
+            reserve_sound_channels()
+        except pygame.error as e:
+            print(f"Sound is not available: {e}")
+
+        _asset_loader = threading.Thread(target=_load_sounds_in_background, name="asset-loader", daemon=True)
+        if pygame.mixer.get_init():
+            _asset_loader.start()
+
+
+def wait_for_assets():
+    """Wait until the assets started by start_loading_assets() are loaded."""
+    if _asset_loader is not None and _asset_loader.is_alive():
+        _asset_loader.join()
+
+
+def assets_loaded():
+    """Check whether the assets started by start_loading_assets() are loaded, without waiting for them.
+
+    Returns:
+        bool: True if every sound was decoded and they can be played.
+    """
+    return _sounds_loaded
+
+
+def play_sound(game, sound_file_path, volume=None):
     """Play a sound effect if sound is enabled.
 
+    Sounds played while the sounds are still loading in the background are skipped, so this never waits.
+
     Args:
         game: The Game instance containing sound settings.
         sound_file_path (str): The path to the sound file.
-        volume (float): The volume level (0.0 to 1.0).
+        volume (float): The volume level (0.0 to 1.0). Defaults to the volume listed in SOUNDS.
     """
     if not game.sfx_enabled:
         return
 
-    sound = pygame.mixer.Sound(sound_file_path)
-    sound.set_volume(volume)
-    sound.play()
+    if not assets_loaded():
+        return
+
+    if volume is None:
+        volume = SOUNDS.get(sound_file_path, 1.0)
+
+    sound = get_sound(sound_file_path, volume)
+    channels = _sound_channels.get(sound_file_path)
+    if channels is not None:
+        # Take the effect's reserved channels in turn, so a repeat only cuts off the oldest of its plays
+        i = _next_sound_channel[sound_file_path]
+        channels[i].play(sound)
+        _next_sound_channel[sound_file_path] = (i + 1) % len(channels)
+    else:
+        sound.play()
+
+
+def wait_for_events(timeout=MENU_EVENT_TIMEOUT):
+    """Sleep until there are events to handle, or until the timeout runs out.
+
+    Used by scenes that only change in response to input, so they use no CPU while nothing happens.
+
+    Args:
+        timeout (int): The most milliseconds to wait for an event.
+
+    Returns:
+        list: The pending events, empty if the timeout ran out.
+    """
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+def wait_for_timestamped_events(timeout):
+    """Sleep for a while, taking each event from the queue as soon as it arrives and noting when it did.
+
+    Used by the game scene to wait for its next frame or tick without delaying input: the time of every key press
+    is known to within a millisecond, instead of only when the next frame starts.
+
+    Args:
+        timeout (float): The seconds to wait. If it is 0 or less, only the pending events are taken.
+
+    Returns:
+        list: A (timestamp, event) pair for each event, in the order they arrived, where the timestamp is the
+              time.perf_counter() value when the event was taken from the queue.
+    """
+    events = []
+    deadline = time.perf_counter() + timeout
+    while True:
+        remaining_ms = math.ceil((deadline - time.perf_counter()) * 1000)
+        if remaining_ms <= 0:
+            break
+
+        event = pygame.event.wait(remaining_ms)
+        if event.type == pygame.NOEVENT:
+            break
+        events.append((time.perf_counter(), event))
+
+    now = time.perf_counter()
+    events.extend((now, event) for event in pygame.event.get())
+    return events
 
 
 def exit_game() -> None: